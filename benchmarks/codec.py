@@ -0,0 +1,104 @@
+"""Encode/decode speed of typical API payloads.
+
+Builds synthetic messages.Messages and updates.Difference results, similar to
+what GetHistory and GetDifference return, and times how fast they are
+serialized and parsed back.
+
+Usage: python benchmarks/codec.py [seconds]
+"""
+
+import sys
+import time
+
+from pyrogram.api import types
+from pyrogram.api.core import Object, Reader
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+
+def user(i: int):
+    return types.User(
+        id=i, access_hash=i * 7919, first_name="User {}".format(i), last_name="Test",
+        username="user{}".format(i), photo=types.UserProfilePhoto(
+            photo_id=i * 31,
+            photo_small=types.FileLocation(2, i * 13, i, i * 17),
+            photo_big=types.FileLocation(2, i * 13, i + 1, i * 19)
+        ),
+        status=types.UserStatusRecently()
+    )
+
+
+def channel(i: int):
+    return types.Channel(
+        id=i, title="Channel {}".format(i), photo=types.ChatPhotoEmpty(),
+        date=1514764800, version=0, access_hash=i * 104729, username="channel{}".format(i)
+    )
+
+
+def message(i: int):
+    return types.Message(
+        id=i, to_id=types.PeerChannel(1), date=1514764800 + i, from_id=i % 50,
+        message="Message number {}, with some text in it".format(i),
+        entities=[types.MessageEntityBold(0, 7), types.MessageEntityUrl(8, 6)],
+        media=types.MessageMediaPhoto(
+            photo=types.Photo(
+                id=i, access_hash=i * 3, date=1514764800, sizes=[
+                    types.PhotoSize("s", types.FileLocation(2, i, 1, i * 5), 90, 67, 1234),
+                    types.PhotoSize("m", types.FileLocation(2, i, 2, i * 5), 320, 240, 23456),
+                    types.PhotoSize("x", types.FileLocation(2, i, 3, i * 5), 800, 600, 84567)
+                ]
+            )
+        ) if i % 3 == 0 else None,
+        views=i * 10
+    )
+
+
+PAYLOADS = [
+    (
+        "messages.ChannelMessages",
+        types.messages.ChannelMessages(
+            pts=1, count=100,
+            messages=[message(i) for i in range(100)],
+            chats=[channel(1)],
+            users=[user(i) for i in range(50)]
+        )
+    ),
+    (
+        "updates.Difference",
+        types.updates.Difference(
+            new_messages=[message(i) for i in range(50)],
+            new_encrypted_messages=[],
+            other_updates=[types.UpdateUserStatus(i, types.UserStatusOnline(1514764800)) for i in range(100)],
+            chats=[channel(i) for i in range(10)],
+            users=[user(i) for i in range(50)],
+            state=types.updates.State(1, 2, 1514764800, 3, 4)
+        )
+    )
+]
+
+
+def bench(func) -> float:
+    count = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < SECONDS:
+        func()
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    print("{:<26}{:>10}{:>14}{:>14}".format("Payload", "Size", "Encode/s", "Decode/s"))
+
+    for name, payload in PAYLOADS:
+        data = payload.write()
+
+        encode = bench(payload.write)
+        decode = bench(lambda: Object.read(Reader(data)))
+
+        print("{:<26}{:>8} B{:>14.1f}{:>14.1f}".format(name, len(data), encode, decode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Export speed of TL objects to JSON.
+
+Compares the generic JSONEncoder walk that Object.__str__ used to do (every
+field looked up by name through __slots__, recursively) with the generated
+to_dict methods, both as plain dicts and as a JSON Lines stream written with
+write_jsonl.
+
+Usage: python benchmarks/export.py [seconds]
+"""
+
+import io
+from collections import OrderedDict
+from json import JSONEncoder
+
+from codec import PAYLOADS, bench
+from pyrogram.api.all import objects
+from pyrogram.api.core import Object, write_jsonl
+
+
+class GenericEncoder(JSONEncoder):
+    # The encoder Object.__str__ used before to_dict was generated
+    def default(self, o):
+        if not isinstance(o, Object):
+            return repr(o)
+
+        return OrderedDict(
+            [("_", objects.get(getattr(o, "ID", None), None))]
+            + [(attr, getattr(o, attr)) for attr in o.__slots__]
+        )
+
+
+def main():
+    generic = GenericEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    print("{:<26}{:>14}{:>14}{:>14}".format("Payload", "Generic/s", "to_dict/s", "JSON Lines/s"))
+
+    for name, payload in PAYLOADS:
+        # Exporting a history means writing every message on its own line
+        items = payload.messages if hasattr(payload, "messages") else payload.new_messages
+
+        def encode_generic():
+            fp = io.StringIO()
+
+            for i in items:
+                fp.write(generic.encode(i))
+                fp.write("\n")
+
+        print("{:<26}{:>14.1f}{:>14.1f}{:>14.1f}".format(
+            name,
+            bench(encode_generic),
+            bench(lambda: [i.to_dict() for i in items]),
+            bench(lambda: write_jsonl(items, io.StringIO()))
+        ))
+
+
+if __name__ == "__main__":
+    main()
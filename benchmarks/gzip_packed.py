@@ -0,0 +1,55 @@
+"""Gzip of large requests and results.
+
+Shows how much Session.gzip shrinks typical large requests, and how fast
+gzipped results are decompressed, compared to going through the gzip module.
+
+Usage: python benchmarks/gzip_packed.py [seconds]
+"""
+
+import gzip
+
+from codec import PAYLOADS, bench
+from pyrogram.api import functions, types
+from pyrogram.api.core import GzipPacked
+
+REQUESTS = [
+    (
+        "messages.SendMessage",
+        functions.messages.SendMessage(
+            types.InputPeerSelf(),
+            " ".join("Line {} of a long text message.".format(i) for i in range(100)),
+            1
+        )
+    ),
+    (
+        "contacts.ImportContacts",
+        functions.contacts.ImportContacts([
+            types.InputPhoneContact(i, "39{:08d}".format(i), "Contact", str(i)) for i in range(500)
+        ])
+    )
+]
+
+
+def main():
+    print("{:<26}{:>10}{:>10}{:>8}".format("Request", "Size", "Gzipped", "Ratio"))
+
+    for name, request in REQUESTS:
+        raw = request.write()
+        packed = GzipPacked.compress(raw)
+
+        print("{:<26}{:>8} B{:>8} B{:>8.0%}".format(name, len(raw), len(packed), len(packed) / len(raw)))
+
+    print("\n{:<26}{:>14}{:>16}".format("Result", "gzip module/s", "GzipPacked/s"))
+
+    for name, payload in PAYLOADS:
+        data = memoryview(gzip.compress(payload.write()))
+
+        print("{:<26}{:>14.1f}{:>16.1f}".format(
+            name,
+            bench(lambda: gzip.decompress(data)),
+            bench(lambda: GzipPacked.decompress(data))
+        ))
+
+
+if __name__ == "__main__":
+    main()
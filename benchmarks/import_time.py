@@ -0,0 +1,65 @@
+"""Startup cost of importing Pyrogram.
+
+Generated types and functions are imported lazily, the first time they are
+decoded or accessed. This script measures, in fresh interpreters, how long
+"import pyrogram" takes and how much memory it allocates, compared to
+loading every constructor upfront (which is what startup used to do).
+
+Usage: python benchmarks/import_time.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+# Time and memory are measured in separate runs: tracing allocations slows imports down
+TIME = """
+import time
+start = time.perf_counter()
+import pyrogram
+{}
+print(time.perf_counter() - start)
+"""
+
+MEMORY = """
+import tracemalloc
+tracemalloc.start()
+import pyrogram
+{}
+print(tracemalloc.get_traced_memory()[0])
+"""
+
+EAGER = """
+from pyrogram.api.all import objects
+from pyrogram.api.core import Object
+for i in objects:
+    Object.all[i]
+"""
+
+CASES = [
+    ("import pyrogram", ""),
+    ("all constructors loaded", EAGER)
+]
+
+
+def run(script: str) -> float:
+    return float(subprocess.check_output([sys.executable, "-c", script], stderr=subprocess.DEVNULL))
+
+
+def main():
+    print("{} runs each, median\n".format(RUNS))
+    print("{:<26}{:>12}{:>12}".format("Case", "Time", "Memory"))
+
+    for name, code in CASES:
+        run(TIME.format(code))  # Warm up: compile .pyc files
+
+        elapsed = statistics.median(run(TIME.format(code)) for _ in range(RUNS))
+        memory = run(MEMORY.format(code))
+
+        print("{:<26}{:>9.1f} ms{:>9.1f} MB".format(name, elapsed * 1000, memory / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main()
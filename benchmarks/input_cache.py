@@ -0,0 +1,42 @@
+"""Serialization of broadcast requests with and without cached input objects.
+
+Sends the same document to 100 peers, the way a broadcast loop does: the
+InputPeer* and InputDocument objects are created once and reused for every
+request. With Immutable.cache_writes enabled their bytes are only built the
+first time.
+
+Usage: python benchmarks/input_cache.py [seconds]
+"""
+
+from codec import bench
+from pyrogram.api import functions, types
+from pyrogram.api.core import Immutable
+
+PEERS = [
+    types.InputPeerUser(i, i * 7919) if i % 2 else types.InputPeerChannel(i, i * 104729)
+    for i in range(100)
+]
+
+DOCUMENT = types.InputDocument(1234567890123, -987654321098765)
+
+
+def broadcast():
+    for i, peer in enumerate(PEERS):
+        functions.messages.SendMedia(
+            peer=peer,
+            media=types.InputMediaDocument(DOCUMENT),
+            message="Weekly report",
+            random_id=i
+        ).write()
+
+
+def main():
+    print("{:<10}{:>14}".format("Cache", "Broadcasts/s"))
+
+    for cache in [False, True]:
+        Immutable.cache_writes = cache
+        print("{:<10}{:>14.1f}".format("on" if cache else "off", bench(broadcast)))
+
+
+if __name__ == "__main__":
+    main()
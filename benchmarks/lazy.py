@@ -0,0 +1,50 @@
+"""Eager vs lazy decoding of a messages.ChannelMessages result.
+
+Decodes the payload from codec.py and then reads only a few fields, as
+handlers usually do: the id and text of every message (a history scan), or
+of the latest message only. With a lazy Reader the untouched objects (media,
+entities, users, ...) are stepped over but never decoded.
+
+Usage: python benchmarks/lazy.py [seconds]
+"""
+
+import tracemalloc
+
+from codec import PAYLOADS, bench
+from pyrogram.api.core import Object, Reader
+
+DATA = dict(PAYLOADS)["messages.ChannelMessages"].write()
+
+
+def history(lazy: bool):
+    r = Object.read(Reader(DATA, lazy=lazy))
+    return r, [(m.id, m.message) for m in r.messages]
+
+
+def latest(lazy: bool):
+    r = Object.read(Reader(DATA, lazy=lazy))
+    return r, (r.messages[0].id, r.messages[0].message)
+
+
+def measure(func, lazy: bool) -> int:
+    tracemalloc.start()
+    result = func(lazy)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del result
+    return size
+
+
+def main():
+    print("{:<16}{:<10}{:>12}{:>14}".format("Scan", "Decoding", "Scans/s", "Memory"))
+
+    for func in [history, latest]:
+        for name, lazy in [("eager", False), ("lazy", True)]:
+            print("{:<16}{:<10}{:>12.1f}{:>11.1f} KB".format(
+                func.__name__, name, bench(lambda: func(lazy)), measure(func, lazy) / 1024
+            ))
+
+
+if __name__ == "__main__":
+    main()
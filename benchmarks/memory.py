@@ -0,0 +1,78 @@
+"""Per-object memory footprint of the generated TL types.
+
+Every type compiled from compiler/api/template stores its fields in __slots__.
+This script builds the same objects with an equivalent __dict__-based class
+and compares how much memory each one takes.
+
+Usage: python benchmarks/memory.py [count]
+"""
+
+import sys
+import tracemalloc
+
+from pyrogram.api import types
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+SAMPLES = [
+    (
+        types.User,
+        lambda: dict(
+            id=123456789, access_hash=-1234567890123456789, first_name="Pyrogram",
+            last_name="Bot", username="pyrogrambot", is_self=None, contact=None
+        )
+    ),
+    (
+        types.Message,
+        lambda: dict(
+            id=42, to_id=types.PeerUser(123456789), date=1514764800,
+            message="Hello, World!", from_id=987654321
+        )
+    ),
+    (
+        types.InputPeerUser,
+        lambda: dict(user_id=123456789, access_hash=-1234567890123456789)
+    ),
+    (
+        types.PhotoSize,
+        lambda: dict(
+            type="s", location=types.FileLocation(2, 123456789, 42, -1234567890123456789),
+            w=90, h=90, size=1234
+        )
+    )
+]
+
+
+def unslotted(cls):
+    # Same constructor, but a plain class with a per-instance __dict__ (the pre-__slots__ layout)
+    return type(cls.__name__, (), {"__init__": cls.__init__})
+
+
+def measure(cls, kwargs) -> float:
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    objects = [cls(**kwargs()) for _ in range(COUNT)]
+
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    del objects
+    return size / COUNT
+
+
+def main():
+    print("{} objects each\n".format(COUNT))
+    print("{:<16}{:>12}{:>12}{:>12}".format("Type", "__dict__", "__slots__", "Saved"))
+
+    for cls, kwargs in SAMPLES:
+        before = measure(unslotted(cls), kwargs)
+        after = measure(cls, kwargs)
+
+        print("{:<16}{:>10.0f} B{:>10.0f} B{:>11.0%}".format(
+            cls.__name__, before, after, (before - after) / before
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Dispatch speed of incoming packets with parallel net workers.
+
+Replays a synthetic flood of encrypted updates packets, like the ones a busy
+account receives, through a Session: packets are submitted as the RecvThread
+does and dispatched by the NetWorker. Compares unpacking everything in the
+NetWorker against pools of worker threads and processes, and checks that the
+updates are still delivered in the order they arrived.
+
+Processes only pay off with the pure Python AES fallback (TgCrypto not
+installed), which holds the GIL while decrypting.
+
+Usage: python benchmarks/net_workers.py [packets] [workers]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from hashlib import sha256
+from queue import Queue
+from threading import Thread
+
+from codec import channel, message, user
+from pyrogram.api import types
+from pyrogram.api.core import Long, Message
+from pyrogram.crypto import AES, KDF
+from pyrogram.session import Session
+from pyrogram.session.internals import ReplayWindow
+
+PACKETS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 4
+
+AUTH_KEY = os.urandom(256)
+
+
+class Client:
+    def __init__(self):
+        self.updates_queue = Queue()
+
+
+def encrypt(session: Session, i: int) -> bytes:
+    # What the server sends: an Updates with a new channel message, its author and the channel
+    body = types.Update(  # updates#74ae4240
+        updates=[types.UpdateNewChannelMessage(message(i), i, 1)],
+        users=[user(i % 50)],
+        chats=[channel(1)],
+        date=1514764800 + i,
+        seq=0
+    )
+
+    data = Long(0) + session.session_id + Message(body, (1514764800 + i) * 2 ** 32 + 1, i * 2 + 1).write()
+    data += os.urandom(-(len(data) + 12) % 16 + 12)
+
+    msg_key = sha256(AUTH_KEY[96:128] + data).digest()[8:24]
+    aes_key, aes_iv = KDF(AUTH_KEY, msg_key, False)
+
+    return session.auth_key_id + msg_key + AES.ige_encrypt(data, aes_key, aes_iv)
+
+
+def replay(session: Session, packets: list, workers: int, processes: bool) -> float:
+    session.NET_PROCESSES = processes
+    session.pending_acks.take()  # Acks of the previous run, never sent: there is no connection
+    session.replay_window = ReplayWindow(Session.REPLAY_WINDOW)  # Otherwise the packets would be dropped as replayed
+
+    if workers > 1:
+        session.net_executor = (ProcessPoolExecutor if processes else ThreadPoolExecutor)(workers)
+
+        # Warm up: processes are spawned lazily
+        for f in [session.submit(packets[0]) for _ in range(workers)]:
+            f.result()
+
+    net_worker = Thread(target=session.net_worker)
+    net_worker.start()
+
+    start = time.perf_counter()
+
+    for packet in packets:
+        session.recv_queue.put(session.submit(packet))
+
+    session.recv_queue.put(None)
+    net_worker.join()
+
+    elapsed = time.perf_counter() - start
+
+    if session.net_executor is not None:
+        session.net_executor.shutdown()
+        session.net_executor = None
+
+    updates = session.client.updates_queue
+    ids = [updates.get().updates[0].message.id for _ in range(updates.qsize())]
+    assert ids == list(range(len(packets))), "updates were dispatched out of order"
+
+    return elapsed
+
+
+def main():
+    session = Session(2, False, {}, AUTH_KEY, 1, client=Client())
+    packets = [encrypt(session, i) for i in range(PACKETS)]
+
+    print("{} packets of {:.0f} bytes on average, {} workers\n".format(
+        PACKETS, sum(len(i) for i in packets) / PACKETS, WORKERS
+    ))
+    print("{:<24}{:>12}{:>12}".format("Unpacked by", "Packets/s", "Speedup"))
+
+    baseline = None
+
+    for name, workers, processes in [
+        ("NetWorker only", 1, False),
+        ("{} threads".format(WORKERS), WORKERS, False),
+        ("{} processes".format(WORKERS), WORKERS, True)
+    ]:
+        elapsed = replay(session, packets, workers, processes)
+        baseline = baseline or elapsed
+
+        print("{:<24}{:>12.0f}{:>11.2f}x".format(name, PACKETS / elapsed, baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main()
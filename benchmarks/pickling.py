@@ -0,0 +1,103 @@
+"""Pickling cost of TL objects, e.g.: when shipping updates to a multiprocessing pool.
+
+TL objects pickle as their own wire encoding and are decoded again when
+unpickled. This script compares that with default pickling, which walks the
+whole object graph field by field, on batches of Updates like the ones
+received from Telegram.
+
+Usage: python benchmarks/pickling.py [seconds]
+"""
+
+import io
+import pickle
+from datetime import datetime
+
+from codec import bench, channel, message, user
+from pyrogram.api import functions, types
+from pyrogram.api.core import Object, Message, MsgContainer, FutureSalt, FutureSalts, GzipPacked, Template
+
+BATCHES = [
+    (
+        "Updates (10 messages)",
+        types.Update(
+            updates=[types.UpdateNewChannelMessage(message(i), i, 1) for i in range(10)],
+            users=[user(i) for i in range(10)],
+            chats=[channel(1)],
+            date=1514764800,
+            seq=0
+        )
+    ),
+    (
+        "Updates (100 statuses)",
+        types.Update(
+            updates=[types.UpdateUserStatus(i, types.UserStatusOnline(1514764800)) for i in range(100)],
+            users=[],
+            chats=[],
+            date=1514764800,
+            seq=0
+        )
+    )
+]
+
+
+def subclasses(cls):
+    for i in cls.__subclasses__():
+        yield i
+        yield from subclasses(i)
+
+
+class DefaultPickler(pickle.Pickler):
+    # Bypasses Object.__reduce_ex__: objects are pickled field by field, as with any other __slots__ class
+    dispatch_table = {cls: lambda o: object.__reduce_ex__(o, pickle.HIGHEST_PROTOCOL) for cls in subclasses(Object)}
+
+
+def dumps_default(obj) -> bytes:
+    f = io.BytesIO()
+    DefaultPickler(f, pickle.HIGHEST_PROTOCOL).dump(obj)
+
+    return f.getvalue()
+
+
+def dumps_wire(obj) -> bytes:
+    return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+
+def check():
+    # Core objects have no matching read/write pair: they are pickled field by field instead of as their encoding
+    salt = FutureSalt(datetime(2018, 1, 1), datetime(2018, 1, 2), 42)
+    ping = Message(functions.Ping(1), 5, 1)
+    template = Template(functions.upload.GetFile(types.InputDocumentFileLocation(1, 2, 0), 0, 1024), "offset")
+
+    for obj in [
+        ping,
+        MsgContainer([ping, Message(b"raw", 9, 3)]),
+        salt,
+        FutureSalts(7, datetime(2018, 1, 1), [salt]),
+        GzipPacked(functions.Ping(2)),
+        template.patch(offset=2048)
+    ]:
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        assert pickle.loads(data) == obj, "{} does not round-trip".format(type(obj).__name__)
+
+    for name, batch in BATCHES:
+        assert pickle.loads(dumps_wire(batch)) == batch, "{} does not round-trip".format(name)
+
+    assert pickle.loads(pickle.dumps(template)).patch(offset=4096).write() == template.patch(offset=4096).write()
+
+
+def main():
+    check()
+
+    print("{:<24}{:<10}{:>10}{:>12}{:>12}".format("Batch", "Pickling", "Size", "Dumps/s", "Loads/s"))
+
+    for name, batch in BATCHES:
+        for method, dumps in [("default", dumps_default), ("wire", dumps_wire)]:
+            data = dumps(batch)
+
+            print("{:<24}{:<10}{:>8} B{:>12.1f}{:>12.1f}".format(
+                name, method, len(data), bench(lambda: dumps(batch)), bench(lambda: pickle.loads(data))
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Round-trip fuzzing and per-constructor speed of the TL codec.
+
+Reads the schema in compiler/api/source/*.tl, builds random but valid
+instances of every generated constructor and checks that they survive a
+write -> read round trip byte for byte, both eagerly and lazily decoded, and
+that skipping them steps over exactly their encoding. Then times the encode
+and decode speed of each constructor.
+
+Results can be saved and compared against a previous run, so that codec
+changes can be checked for regressions:
+
+    python benchmarks/roundtrip.py --save before.json
+    (change the codec, regenerate the API)
+    python benchmarks/roundtrip.py --baseline before.json
+
+Usage: python benchmarks/roundtrip.py [--seconds S] [--instances N] [--seed SEED] [--filter NAME]
+                                      [--save FILE] [--baseline FILE] [--check-only]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+
+from pyrogram.api.all import objects
+from pyrogram.api.core import Object, Reader
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "compiler", "api", "source")
+
+SECTION_RE = re.compile(r"---(\w+)---")
+COMBINATOR_RE = re.compile(r"^([\w.]+)#([0-9a-f]+)\s(.*)=\s([\w<>.]+);")
+ARGS_RE = re.compile(r"(\w+):([\w?!.<>%#]+)")
+FLAG_RE = re.compile(r"flags\.(\d+)\?(.+)")
+
+MAX_DEPTH = 4  # Past this depth, the simplest constructor of each type is chosen and vectors are empty
+
+TEXT = "abcdefghijklmnopqrstuvwxyz ABCXYZ 0123456789 àèìòù ПРИВЕТ 你好 🙂"
+
+
+def parse() -> dict:
+    """Constructors of the schema, by ID: (section, name, args, type)"""
+    schema = {}
+
+    for name in sorted(os.listdir(SOURCE)):
+        if not name.endswith(".tl"):
+            continue
+
+        section = "types"
+
+        with open(os.path.join(SOURCE, name), encoding="utf-8") as f:
+            for line in f:
+                s = SECTION_RE.match(line)
+
+                if s:
+                    section = s.group(1)
+                    continue
+
+                c = COMBINATOR_RE.match(line)
+
+                if c:
+                    # Generic parameters ({X:Type}) are not fields
+                    args = ARGS_RE.findall(re.sub(r"{.*?}", "", c.group(3)))
+                    args = [("is_self" if k == "self" else k, v) for k, v in args if v != "#"]
+
+                    schema[int(c.group(2), 16)] = (section, c.group(1), args, c.group(4))
+
+    # Core constructors (Message, GzipPacked, ...) are hand-written and Pyrogram types are not TL objects
+    return {
+        k: v for k, v in schema.items()
+        if k in objects and not objects[k].startswith("core.") and "pyrogram" not in objects[k]
+    }
+
+
+class Fuzzer:
+    def __init__(self, schema: dict, seed: str):
+        self.schema = schema
+        self.random = random.Random(seed)
+        self.by_type = {}
+
+        for i, (section, name, args, type) in schema.items():
+            if section == "types":
+                self.by_type.setdefault(type, []).append(i)
+
+        self.functions = [i for i, c in schema.items() if c[0] == "functions" and not self.weight(i)]
+        self.types = [i for i, c in schema.items() if c[0] == "types" and not self.weight(i)]
+
+    def weight(self, i: int) -> int:
+        # How many fields of a constructor need further objects
+        return sum(
+            1 for name, type in self.schema[i][2]
+            if FLAG_RE.sub(r"\2", type) not in ("int", "long", "int128", "int256", "double",
+                                                 "string", "bytes", "Bool", "true")
+        )
+
+    def pick(self, type: str, depth: int) -> int:
+        ids = self.by_type[type]
+
+        if depth >= MAX_DEPTH:
+            least = min(self.weight(i) for i in ids)
+            ids = [i for i in ids if self.weight(i) == least]
+
+        return self.random.choice(ids)
+
+    def value(self, type: str, depth: int):
+        r = self.random
+
+        if type == "int":
+            return r.randint(-2 ** 31, 2 ** 31 - 1)
+        elif type == "long":
+            return r.randint(-2 ** 63, 2 ** 63 - 1)
+        elif type in ("int128", "int256"):
+            bits = int(type[3:])
+            return r.randint(-2 ** (bits - 1), 2 ** (bits - 1) - 1)
+        elif type == "double":
+            return r.uniform(-1e9, 1e9)
+        elif type == "Bool":
+            return r.random() < 0.5
+        elif type == "true":
+            return True
+        elif type == "string":
+            return "".join(r.choice(TEXT) for _ in range(r.choice([0, 1, 5, 20, 300])))
+        elif type == "bytes":
+            # Lengths around 254 switch to the long length prefix
+            return bytes(r.getrandbits(8) for _ in range(r.choice([0, 1, 3, 253, 254, 1000])))
+        elif type.lower().startswith("vector<"):
+            count = 0 if depth >= MAX_DEPTH else r.randint(0, 3)
+            return [self.value(type[7:-1], depth + 1) for _ in range(count)]
+        elif type == "!X":
+            return self.build(r.choice(self.functions), depth + 1)
+        elif type in ("X", "Object"):
+            return self.build(r.choice(self.types), depth + 1)
+        else:
+            return self.build(self.pick(type, depth), depth + 1)
+
+    def build(self, i: int, depth: int = 0) -> Object:
+        kwargs = {}
+        flags = {}
+
+        for name, type in self.schema[i][2]:
+            flag = FLAG_RE.match(type)
+
+            if not flag:
+                kwargs[name] = self.value(type, depth)
+                continue
+
+            index, type = flag.groups()
+
+            # Fields sharing a flag bit (e.g.: User.bot and User.bot_info_version) are all set or all unset
+            if flags.setdefault(index, self.random.random() < 0.5):
+                kwargs[name] = self.value(type, depth)
+            else:
+                kwargs[name] = None
+
+        return Object.all[i](**kwargs)
+
+
+def check(obj: Object) -> bytes:
+    """Round-trip an object; returns its encoding, or raises AssertionError"""
+    data = obj.write()
+
+    eager = Object.read(Reader(data))
+    assert eager.write() == data, "eager decoding does not round-trip"
+    # An empty optional vector is encoded as an absent one, and decoded as []: both compare equal
+    assert eager == obj, "decoding gives a different object"
+
+    lazy = Object.read(Reader(data, lazy=True))
+    assert lazy.write() == data, "lazy decoding does not round-trip"
+    assert lazy == eager, "lazy and eager decoding differ"
+
+    b = Reader(data)
+    Object.skip(b)
+    assert b.offset == len(data), "skip stopped at {} of {} bytes".format(b.offset, len(data))
+
+    return data
+
+
+def bench(func, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < seconds:
+        func()
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip fuzzing and per-constructor speed of the TL codec")
+    parser.add_argument("--seconds", type=float, default=0.02, help="timing budget per constructor and direction")
+    parser.add_argument("--instances", type=int, default=20, help="random instances checked per constructor")
+    parser.add_argument("--seed", default="pyrogram", help="the same seed builds the same instances")
+    parser.add_argument("--filter", default="", help="only constructors whose name contains this text")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results saved in this JSON file")
+    parser.add_argument("--check-only", action="store_true", help="only fuzz, skip timing")
+    args = parser.parse_args()
+
+    schema = parse()
+    baseline = {}
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+
+    header = "{:<48}{:>8}{:>12}{:>10}{:>12}{:>10}".format("Constructor", "Size", "Encode/s", "MB/s", "Decode/s", "MB/s")
+
+    if not args.check_only:
+        print(header + ("{:>10}{:>10}".format("Enc.", "Dec.") if baseline else ""))
+
+    for i, (section, name, _, _) in sorted(schema.items(), key=lambda x: (x[1][0], x[1][1])):
+        name = "{}.{}".format(section, name)
+
+        if args.filter not in name:
+            continue
+
+        # Seeded per constructor: filtering does not change the instances
+        fuzzer = Fuzzer(schema, "{}-{}".format(args.seed, i))
+        obj = data = None
+
+        try:
+            for _ in range(args.instances):
+                obj = fuzzer.build(i)
+                data = check(obj)
+        except Exception as e:
+            failures.append((name, "{}: {}".format(type(e).__name__, e), obj))
+            continue
+
+        if args.check_only:
+            continue
+
+        encode = bench(obj.write, args.seconds)
+        decode = bench(lambda: Object.read(Reader(data)), args.seconds)
+        results[name] = {"size": len(data), "encode": encode, "decode": decode}
+
+        line = "{:<48}{:>6} B{:>12.0f}{:>10.1f}{:>12.0f}{:>10.1f}".format(
+            name, len(data), encode, encode * len(data) / 1e6, decode, decode * len(data) / 1e6
+        )
+
+        if name in baseline:
+            line += "{:>+9.0%}{:>+10.0%}".format(
+                encode / baseline[name]["encode"] - 1, decode / baseline[name]["decode"] - 1
+            )
+
+        print(line)
+
+    if results:
+        print("\n{} constructors, geometric mean: {:.0f} encodes/s, {:.0f} decodes/s".format(
+            len(results), geomean(r["encode"] for r in results.values()), geomean(r["decode"] for r in results.values())
+        ))
+
+        common = [k for k in results if k in baseline]
+
+        if common:
+            print("Against baseline ({} constructors): encode {:+.1%}, decode {:+.1%}".format(
+                len(common),
+                geomean(results[k]["encode"] / baseline[k]["encode"] for k in common) - 1,
+                geomean(results[k]["decode"] / baseline[k]["decode"] for k in common) - 1
+            ))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+
+    print("\n{} round-trip failures".format(len(failures)))
+
+    for name, error, obj in failures:
+        print("\n{}: {}\n    {!r}".format(name, error, obj))
+
+    sys.exit(1 if failures else 0)
+
+
+def geomean(values) -> float:
+    values = list(values)
+    return math.exp(sum(math.log(i) for i in values) / len(values))
+
+
+if __name__ == "__main__":
+    main()
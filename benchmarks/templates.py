@@ -0,0 +1,53 @@
+"""Per-chunk serialization cost of file transfer requests.
+
+get_file and save_file send the same function over and over, with only the
+offset or the part number and its bytes changing. This script compares
+building and serializing a new function for each chunk with patching a
+Template that was serialized once.
+
+Usage: python benchmarks/templates.py [seconds]
+"""
+
+import os
+from itertools import count
+
+from codec import bench
+from pyrogram.api import functions, types
+from pyrogram.api.core import Template
+
+LOCATION = types.InputDocumentFileLocation(id=1234567890, access_hash=-1234567890123456789, version=0)
+LIMIT = 1024 * 1024
+CHUNK = os.urandom(512 * 1024)
+
+
+def get_file_new(i: int) -> bytes:
+    return functions.upload.GetFile(LOCATION, i % 2000 * LIMIT, LIMIT).write()
+
+
+def save_part_new(i: int) -> bytes:
+    return functions.upload.SaveBigFilePart(42, i, 1000, CHUNK).write()
+
+
+def main():
+    get_file = Template(functions.upload.GetFile(LOCATION, 0, LIMIT), "offset")
+    save_part = Template(functions.upload.SaveBigFilePart(42, 0, 1000, b""), "file_part", tail="bytes")
+
+    cases = [
+        ("upload.GetFile", get_file_new, lambda i: get_file.patch(offset=i % 2000 * LIMIT).write()),
+        ("upload.SaveBigFilePart", save_part_new, lambda i: save_part.patch(file_part=i, bytes=CHUNK).write())
+    ]
+
+    print("{:<26}{:>14}{:>14}{:>10}".format("Request", "New/s", "Template/s", "Speedup"))
+
+    for name, new, template in cases:
+        assert new(7) == template(7)
+
+        chunks = count()
+        a = bench(lambda: new(next(chunks)))
+        b = bench(lambda: template(next(chunks)))
+
+        print("{:<26}{:>14.0f}{:>14.0f}{:>9.1f}x".format(name, a, b, b / a))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Decoding of long Vector<int> and Vector<long> values.
+
+Vectors of ints and longs are read in bulk through array.array. This script
+compares that with reading them one element at a time, for a MsgsAck with
+5000 msg_ids (Vector<long>) and a bare Vector<int> of 5000 views, like the
+result of messages.GetMessagesViews.
+
+Usage: python benchmarks/vectors.py [seconds]
+"""
+
+from codec import bench
+from pyrogram.api import types
+from pyrogram.api.core import Object, Reader, Vector, Int, Long
+
+COUNT = 5000
+
+ACKS = types.MsgsAck([i * 4 + (1 << 62) for i in range(COUNT)]).write()
+VIEWS = Vector(list(range(COUNT)), Int)
+
+
+def per_element(data: bytes, t: Object, offset: int):
+    b = Reader(data, offset)
+    return [t.read(b) for _ in range(Int.read(b))]
+
+
+CASES = [
+    ("MsgsAck", lambda: Object.read(Reader(ACKS)), lambda: per_element(ACKS, Long, 8)),
+    ("Vector<int> (bare)", lambda: Object.read(Reader(VIEWS)), lambda: per_element(VIEWS, Int, 4))
+]
+
+
+def main():
+    print("{} elements\n".format(COUNT))
+    print("{:<22}{:>14}{:>14}{:>14}".format("Payload", "Per element/s", "Bulk/s", "Array/s"))
+
+    for name, bulk, slow in CASES:
+        per_element_speed = bench(slow)
+        bulk_speed = bench(bulk)
+
+        Vector.as_array = True
+        array_speed = bench(bulk)
+        Vector.as_array = False
+
+        print("{:<22}{:>14.1f}{:>14.1f}{:>14.1f}".format(name, per_element_speed, bulk_speed, array_speed))
+
+
+if __name__ == "__main__":
+    main()
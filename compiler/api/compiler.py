@@ -33,6 +33,9 @@ FLAGS_RE_3 = re.compile(r"flags:#")
 INT_RE = re.compile(r"int(\d+)")
 
 core_types = ["int", "long", "int128", "int256", "double", "bytes", "string", "Bool"]
+struct_formats = {"int": "i", "long": "q", "double": "d"}
+identity_types = ["Peer", "FileLocation"]
+fixed_sizes = {"int": 4, "long": 8, "int128": 16, "int256": 32, "double": 8, "Bool": 4}
 types_to_constructors = {}
 types_to_functions = {}
 constructors_to_functions = {}
@@ -140,6 +143,214 @@ def sort_args(args):
     return args + flags
 
 
+def write_core_type(t: str, value: str) -> str:
+    """Statement that appends a core type value to the bytearray b"""
+    if t in ["bytes", "string"]:
+        # Bytes and strings go straight into the buffer, no intermediate copy
+        return "{}.write_into(b, {})".format(t.title(), value)
+
+    return "b += {}({})".format(t.title(), value)
+
+
+def group_fixed_args(args: list) -> list:
+    """Merge runs of consecutive fixed-width (non-flag) args into lists"""
+    groups = []
+
+    for arg in args:
+        if arg[1] in struct_formats:
+            if groups and isinstance(groups[-1], list):
+                groups[-1].append(arg)
+            else:
+                groups.append([arg])
+        else:
+            groups.append(arg)
+
+    return [i[0] if isinstance(i, list) and len(i) == 1 else i for i in groups]
+
+
+def is_immutable(c: Combinator) -> bool:
+    """Input constructors with only primitive fields, whose serialized bytes can be cached"""
+    return (
+        c.section == "types"
+        and c.return_type.startswith("Input")
+        and bool(c.args)
+        and all(i[1].split("?")[-1] in core_types + ["true"] for i in c.args)
+    )
+
+
+def is_hashable(c: Combinator) -> bool:
+    """Input and identity constructors with only primitive fields, usable as set members and dict keys"""
+    return (
+        c.section == "types"
+        and (c.return_type.startswith("Input") or c.return_type in identity_types)
+        and all(i[1].split("?")[-1] in core_types + ["true"] for i in c.args)
+    )
+
+
+def is_set_if_truthy(arg_type: str) -> bool:
+    """Flags set by the truth value of their field, instead of it not being None: true flags and optional vectors.
+
+    Decoded objects have False in their unset true flags and [] in their absent vectors, so None and these values
+    mean the same. The generated write_into and __eq__/__hash__ both follow this, so that equal objects encode the same.
+    """
+    return arg_type.endswith("?true") or ("?" in arg_type and "vector" in arg_type.lower())
+
+
+def field_values(args: list, name: str) -> list:
+    """Field values of an object, as compared by __eq__ and __hash__"""
+    # Note: bool is shadowed by the core.primitives.bool module in generated code
+    values = []
+
+    for arg_name, arg_type in args:
+        if arg_type.endswith("?true"):
+            values.append("(not {}.{})".format(name, arg_name))
+        elif is_set_if_truthy(arg_type):
+            values.append("({}.{} or None)".format(name, arg_name))
+        else:
+            values.append("{}.{}".format(name, arg_name))
+
+    return values
+
+
+def eq_method(c: Combinator) -> str:
+    """Body of the generated __eq__"""
+    comparisons = [
+        "{} == {}".format(i, j) for i, j in zip(field_values(c.args, "self"), field_values(c.args, "other"))
+    ]
+
+    if len(comparisons) > 1:
+        return "(\n            " + "\n            and ".join(comparisons) + "\n        )"
+
+    return comparisons[0] if comparisons else "True"
+
+
+def hash_method(c: Combinator) -> str:
+    if not is_hashable(c):
+        return ""
+
+    return "\n    def __hash__(self) -> int:\n        return hash({})\n".format(
+        "({})".format(", ".join(["self.ID"] + field_values(c.args, "self"))) if c.args else "self.ID"
+    )
+
+
+def repr_method(c: Combinator) -> str:
+    """Body of the generated __repr__: the path of the class, followed by its fields"""
+    return "\"{}({})\"{}".format(
+        ".".join(filter(None, [c.section, c.namespace, capit(c.name)])),
+        ", ".join("{}={{!r}}".format(i[0]) for i in c.args),
+        ".format(\n            {}\n        )".format(
+            ",\n            ".join("self.{}".format(i[0]) for i in c.args)
+        ) if c.args else ""
+    )
+
+
+def skip_args(args: list) -> list:
+    """Statements that step over the serialized args without decoding them"""
+    statements = []
+    size = 0
+
+    for arg_name, arg_type in args:
+        flag = FLAGS_RE_2.findall(arg_type)
+
+        # Consecutive fixed-width args are skipped at once
+        if not flag and arg_type in fixed_sizes:
+            size += fixed_sizes[arg_type]
+            continue
+
+        if size:
+            statements.append("b.offset += {}".format(size))
+            size = 0
+
+        if flag:
+            index, arg_type = flag[0]
+
+            if arg_type == "true":
+                continue
+
+            condition = "if flags & (1 << {}):\n            ".format(index)
+        else:
+            condition = ""
+
+        if arg_type in fixed_sizes:
+            statement = "b.offset += {}".format(fixed_sizes[arg_type])
+        elif arg_type in core_types:
+            statement = "Bytes.skip(b)"
+        elif "vector" in arg_type.lower():
+            sub_type = arg_type.split("<")[1][:-1]
+            statement = "Object.skip(b{})".format(", {}".format(sub_type.title()) if sub_type in core_types else "")
+        else:
+            statement = "Object.skip(b)"
+
+        statements.append(condition + statement)
+
+    if size:
+        statements.append("b.offset += {}".format(size))
+
+    return statements
+
+
+def dict_value(arg_type: str, value: str) -> str:
+    """Expression converting a field value to its to_dict representation"""
+    if arg_type in core_types or arg_type == "true":
+        return value
+    elif "vector" in arg_type.lower():
+        sub_type = arg_type.split("<", 1)[1][:-1]
+
+        if sub_type in core_types:
+            return value
+        elif sub_type[0].isupper() and "<" not in sub_type:
+            return "[i.to_dict() for i in {}]".format(value)
+    elif arg_type[0].isupper() and arg_type not in ("Object", "X"):
+        return "{}.to_dict()".format(value)
+
+    # Generic (Object, X, !X) or nested vectors: the exact type is only known at runtime
+    return "Object.dump({})".format(value)
+
+
+def dict_args(c: Combinator) -> str:
+    """Items of the dict literal returned by to_dict, in TL order"""
+    items = ["\"_\": \"{}\"".format(".".join(filter(None, [c.section, c.namespace, capit(c.name)])))]
+
+    for arg_name, arg_type in c.args:
+        flag = FLAGS_RE_2.findall(arg_type)
+        value = "self.{}".format(arg_name)
+
+        if flag:
+            flag_type = flag[0][1]
+            expression = dict_value(flag_type, value)
+
+            if expression != value:
+                expression = "None if {} is None else {}".format(value, expression)
+        else:
+            expression = dict_value(arg_type, value)
+
+        items.append("\"{}\": {}".format(arg_name, expression))
+
+    return ",\n            ".join(items)
+
+
+def from_dict_args(c: Combinator) -> str:
+    """Keyword arguments that rebuild an object from its to_dict representation"""
+    arguments = []
+
+    for arg_name, arg_type in c.args:
+        flag = FLAGS_RE_2.findall(arg_type)
+        value = "d.get(\"{}\")" if flag else "d[\"{}\"]"
+        value = value.format(arg_name)
+        arg_type = flag[0][1] if flag else arg_type
+
+        if arg_type == "bytes":
+            value = "Object.load_bytes({})".format(value)
+        elif arg_type not in core_types and arg_type != "true" and arg_type.lower() not in (
+            "vector<{}>".format(i) for i in core_types
+        ):
+            value = "Object.load({})".format(value)
+
+        arguments.append("{}={}".format(arg_name, value))
+
+    return ",\n            ".join(arguments)
+
+
 def start():
     shutil.rmtree("{}/types".format(DESTINATION), ignore_errors=True)
     shutil.rmtree("{}/functions".format(DESTINATION), ignore_errors=True)
@@ -156,6 +367,9 @@ def start():
     with open("{}/template/pyrogram.txt".format(HOME), encoding="utf-8") as f:
         pyrogram_template = f.read()
 
+    with open("{}/template/dict_methods.txt".format(HOME), encoding="utf-8") as f:
+        dict_methods_template = f.read()
+
     with open(NOTICE_PATH, encoding="utf-8") as f:
         notice = []
 
@@ -168,6 +382,7 @@ def start():
     layer = None
     namespaces = {"types": set(), "functions": set()}
     combinators = []
+    inits = {}
 
     for line in schema:
         # Check for section changer lines
@@ -251,14 +466,7 @@ def start():
         path = "{}/{}/{}".format(DESTINATION, c.section, c.namespace)
         os.makedirs(path, exist_ok=True)
 
-        init = "{}/__init__.py".format(path)
-
-        if not os.path.exists(init):
-            with open(init, "w", encoding="utf-8") as f:
-                f.write(notice + "\n\n")
-
-        with open(init, "a", encoding="utf-8") as f:
-            f.write("from .{} import {}\n".format(snek(c.name), capit(c.name)))
+        inits.setdefault(path, []).append((capit(c.name), snek(c.name)))
 
         sorted_args = sort_args(c.args)
 
@@ -273,6 +481,8 @@ def start():
             ["self.{0} = {0}  # {1}".format(i[0], i[1]) for i in c.args]
         ) if c.args else "pass"
 
+        slots = ", ".join(['"{}"'.format(i[0]) for i in c.args])
+
         docstring_args = []
         # docs = c.docs.split("|")[1:] if c.docs else None
 
@@ -322,12 +532,14 @@ def start():
             for i in c.args:
                 flag = FLAGS_RE.match(i[1])
                 if flag:
-                    write_flags.append("flags |= (1 << {}) if self.{} is not None else 0".format(flag.group(1), i[0]))
+                    write_flags.append("flags |= (1 << {}) if self.{} {}else 0".format(
+                        flag.group(1), i[0], "" if is_set_if_truthy(i[1]) else "is not None "
+                    ))
 
             write_flags = "\n        ".join([
                 "flags = 0",
                 "\n        ".join(write_flags),
-                "b.write(Int(flags))"
+                "b += Int(flags)"
             ])
         else:
             write_flags = "# No flags"
@@ -335,8 +547,30 @@ def start():
         read_flags = "flags = Int.read(b)" if c.has_flags else "# No flags"
 
         write_types = read_types = ""
+        structs = []
+
+        for arg in group_fixed_args(c.args):
+            if isinstance(arg, list):
+                # A run of fixed-width args is (un)packed with a single precompiled Struct
+                fmt = "".join(struct_formats[i[1]] for i in arg)
+                struct_name = "_struct_{}".format(fmt)
+
+                if struct_name not in structs:
+                    structs.append(struct_name)
 
-        for arg_name, arg_type in c.args:
+                write_types += "\n        "
+                write_types += "b += {}.pack({})\n        ".format(
+                    struct_name, ", ".join("self.{}".format(i[0]) for i in arg)
+                )
+
+                read_types += "\n        "
+                read_types += "{} = b.unpack({})\n        ".format(
+                    ", ".join(i[0] for i in arg), struct_name
+                )
+
+                continue
+
+            arg_name, arg_type = arg
             flag = FLAGS_RE_2.findall(arg_type)
 
             if flag:
@@ -348,7 +582,7 @@ def start():
                 elif flag_type in core_types:
                     write_types += "\n        "
                     write_types += "if self.{} is not None:\n            ".format(arg_name)
-                    write_types += "b.write({}(self.{}))\n        ".format(flag_type.title(), arg_name)
+                    write_types += write_core_type(flag_type, "self.{}".format(arg_name)) + "\n        "
 
                     read_types += "\n        "
                     read_types += "{} = {}.read(b) if flags & (1 << {}) else None".format(
@@ -358,8 +592,8 @@ def start():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += "if self.{} is not None:\n            ".format(arg_name)
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += "if self.{}:\n            ".format(arg_name)
+                    write_types += "Vector.write_into(b, self.{}{})\n        ".format(
                         arg_name, ", {}".format(sub_type.title()) if sub_type in core_types else ""
                     )
 
@@ -370,7 +604,7 @@ def start():
                 else:
                     write_types += "\n        "
                     write_types += "if self.{} is not None:\n            ".format(arg_name)
-                    write_types += "b.write(self.{}.write())\n        ".format(arg_name)
+                    write_types += "self.{}.write_into(b)\n        ".format(arg_name)
 
                     read_types += "\n        "
                     read_types += "{} = Object.read(b) if flags & (1 << {}) else None\n        ".format(
@@ -379,7 +613,7 @@ def start():
             else:
                 if arg_type in core_types:
                     write_types += "\n        "
-                    write_types += "b.write({}(self.{}))\n        ".format(arg_type.title(), arg_name)
+                    write_types += write_core_type(arg_type, "self.{}".format(arg_name)) + "\n        "
 
                     read_types += "\n        "
                     read_types += "{} = {}.read(b)\n        ".format(arg_name, arg_type.title())
@@ -387,7 +621,7 @@ def start():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += "Vector.write_into(b, self.{}{})\n        ".format(
                         arg_name, ", {}".format(sub_type.title()) if sub_type in core_types else ""
                     )
 
@@ -397,7 +631,7 @@ def start():
                     )
                 else:
                     write_types += "\n        "
-                    write_types += "b.write(self.{}.write())\n        ".format(arg_name)
+                    write_types += "self.{}.write_into(b)\n        ".format(arg_name)
 
                     read_types += "\n        "
                     read_types += "{} = Object.read(b)\n        ".format(arg_name)
@@ -414,6 +648,7 @@ def start():
                         class_name=capit(c.name),
                         docstring_args=docstring_args,
                         object_id=c.id,
+                        slots=slots,
                         arguments=arguments,
                         fields=fields
                     )
@@ -423,14 +658,30 @@ def start():
                     mtproto_template.format(
                         notice=notice,
                         class_name=capit(c.name),
+                        base="Immutable" if is_immutable(c) else "Object",
                         docstring_args=docstring_args,
                         object_id=c.id,
+                        slots=slots,
                         arguments=arguments,
                         fields=fields,
+                        structs="\n\n" + "\n".join(
+                            "{} = Struct(\"<{}\")".format(i, i.split("_")[-1]) for i in structs
+                        ) if structs else "",
                         read_flags=read_flags,
                         read_types=read_types,
+                        skip_types="\n        ".join(skip_args(c.args)) or "pass",
                         write_flags=write_flags,
                         write_types=write_types,
+                        write_decorator="@Immutable.cached\n    " if is_immutable(c) else "",
+                        # Pyrogram types keep the generic Object.to_dict, which leaves out unset fields
+                        eq_fields=eq_method(c),
+                        hash_method=hash_method(c),
+                        repr_format=repr_method(c),
+                        dict_methods="" if c.namespace == "pyrogram" else dict_methods_template.format(
+                            class_name=capit(c.name),
+                            dict_items=dict_args(c),
+                            from_dict_arguments="\n            " + from_dict_args(c) + "\n        " if c.args else ""
+                        ).rstrip("\n"),
                         return_arguments=", ".join([i[0] for i in sorted_args])
                     )
                 )
@@ -456,9 +707,22 @@ def start():
 
         f.write("\n}\n")
 
+        # IDs of the Update constructors, the ones a Session can be told to ignore
+        f.write("\nupdates = {")
+        f.write(",".join("\n    {}".format(c.id) for c in combinators if c.return_type == "Update"))
+        f.write("\n}\n")
+
     for k, v in namespaces.items():
-        with open("{}/{}/__init__.py".format(DESTINATION, k), "a", encoding="utf-8") as f:
-            f.write("from . import {}\n".format(", ".join([i for i in v])) if v else "")
+        inits["{}/{}/".format(DESTINATION, k)].extend((i, i) for i in sorted(v))
+
+    # Packages import their classes and sub-namespaces lazily, on first attribute access
+    for path, attrs in inits.items():
+        with open("{}/__init__.py".format(path), "w", encoding="utf-8") as f:
+            f.write(notice + "\n\n")
+            f.write("from pyrogram.api.core.lazy import LazyModule\n\n")
+            f.write("LazyModule.install(__name__, {")
+            f.write(",".join("\n    \"{}\": \".{}\"".format(name, module) for name, module in attrs))
+            f.write("\n})\n")
 
 
 if "__main__" == __name__:
@@ -0,0 +1,41 @@
+from pyrogram import Client
+from pyrogram.api import functions
+
+"""
+This is a faster version of get_history.py
+
+Instead of waiting for each chunk of messages before asking for the next one, the total amount of messages is
+retrieved first and then all the chunks are requested with send_many, which keeps many requests in flight at the
+same time. FloodWait errors are handled by send_many itself.
+"""
+
+app = Client("my_account")
+app.start()
+
+target = "me"  # "me" refers to your own chat (Saved Messages)
+limit = 100  # Amount of messages to retrieve for each API call
+peer = app.resolve_peer(target)
+
+# The first call only tells how many messages there are (small chats return all of them, without a count)
+first = app.send(functions.messages.GetHistory(peer, 0, 0, 0, 1, 0, 0, 0))
+count = getattr(first, "count", len(first.messages))
+
+results = app.send_many(
+    (
+        functions.messages.GetHistory(peer, 0, 0, offset, limit, 0, 0, 0)
+        for offset in range(0, count, limit)
+    ),
+    window=10  # Up to 10 requests waiting for their results at the same time
+)
+
+history = []  # List that will contain all the messages of the target chat
+
+for r in results:
+    if isinstance(r, Exception):
+        print("A chunk failed: {}".format(r))
+    else:
+        history.extend(r.messages)
+
+print("Total messages: {}".format(len(history)))
+
+app.stop()
@@ -19,7 +19,11 @@
 from .future_salt import FutureSalt
 from .future_salts import FutureSalts
 from .gzip_packed import GzipPacked
+from .immutable import Immutable
+from .jsonl import read_jsonl, write_jsonl
 from .message import Message
 from .msg_container import MsgContainer
 from .object import Object
 from .primitives import *
+from .reader import Reader
+from .template import Template
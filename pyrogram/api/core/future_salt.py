@@ -17,14 +17,17 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from datetime import datetime
-from io import BytesIO
 
 from .object import Object
 from .primitives import Int, Long
+from .reader import Reader
 
 
 class FutureSalt(Object):
     ID = 0x0949d9dc
+    LAZY = False
+
+    __slots__ = ["valid_since", "valid_until", "salt"]
 
     def __init__(self, valid_since: int or datetime, valid_until: int or datetime, salt: int):
         self.valid_since = valid_since
@@ -32,9 +35,13 @@ class FutureSalt(Object):
         self.salt = salt
 
     @staticmethod
-    def read(b: BytesIO, *args) -> "FutureSalt":
+    def read(b: Reader, *args) -> "FutureSalt":
         valid_since = datetime.fromtimestamp(Int.read(b))
         valid_until = datetime.fromtimestamp(Int.read(b))
         salt = Long.read(b)
 
         return FutureSalt(valid_since, valid_until, salt)
+
+    @staticmethod
+    def skip(b: Reader, *args):
+        b.offset += 16
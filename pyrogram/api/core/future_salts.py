@@ -17,15 +17,18 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from datetime import datetime
-from io import BytesIO
 
 from . import FutureSalt
 from .object import Object
 from .primitives import Int, Long
+from .reader import Reader
 
 
 class FutureSalts(Object):
     ID = 0xae500895
+    LAZY = False
+
+    __slots__ = ["req_msg_id", "now", "salts"]
 
     def __init__(self, req_msg_id: int, now: int or datetime, salts: list):
         self.req_msg_id = req_msg_id
@@ -33,7 +36,7 @@ class FutureSalts(Object):
         self.salts = salts
 
     @staticmethod
-    def read(b: BytesIO, *args) -> "FutureSalts":
+    def read(b: Reader, *args) -> "FutureSalts":
         req_msg_id = Long.read(b)
         now = datetime.fromtimestamp(Int.read(b))
 
@@ -41,3 +44,9 @@ class FutureSalts(Object):
         salts = [FutureSalt.read(b) for _ in range(count)]
 
         return FutureSalts(req_msg_id, now, salts)
+
+    @staticmethod
+    def skip(b: Reader, *args):
+        b.offset += 12  # req_msg_id, now
+        count = Int.read(b)
+        b.offset += count * 16
@@ -16,41 +16,56 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from gzip import compress, decompress
-from io import BytesIO
+import zlib
 
 from .object import Object
 from .primitives import Int, Bytes
+from .reader import Reader
 
 
 class GzipPacked(Object):
     ID = 0x3072cfa1
+    LAZY = False
 
-    def __init__(self, packed_data: Object):
+    __slots__ = ["packed_data"]
+
+    def __init__(self, packed_data: Object or bytes):
+        # packed_data is either the Object to pack or its already compressed bytes
         self.packed_data = packed_data
 
     @staticmethod
-    def read(b: BytesIO, *args) -> "GzipPacked":
+    def compress(data: bytes) -> bytes:
+        c = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return c.compress(data) + c.flush()
+
+    @staticmethod
+    def decompress(data: memoryview) -> bytes:
+        # Straight from the shared buffer into a single new one, without going through gzip's file objects
+        return zlib.decompressobj(32 + zlib.MAX_WBITS).decompress(data)
+
+    @staticmethod
+    def read(b: Reader, *args) -> "GzipPacked":
         # Return the Object itself instead of a GzipPacked wrapping it
         return Object.read(
-            BytesIO(
-                decompress(
-                    Bytes.read(b)
-                )
+            Reader(
+                GzipPacked.decompress(
+                    Bytes.read_view(b)
+                ),
+                lazy=b.lazy,
+                ignore=b.ignore
             )
         )
 
-    def write(self) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def skip(b: Reader, *args):
+        Bytes.skip(b)
 
-        b.write(Int(self.ID, False))
+    def write_into(self, b: bytearray):
+        b += Int(self.ID, False)
 
-        b.write(
-            Bytes(
-                compress(
-                    self.packed_data.write()
-                )
-            )
+        Bytes.write_into(
+            b,
+            self.packed_data
+            if isinstance(self.packed_data, bytes)
+            else GzipPacked.compress(self.packed_data.write())
         )
-
-        return b.getvalue()
@@ -0,0 +1,60 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from functools import wraps
+
+from .object import Object
+
+
+class Immutable(Object):
+    """Base of the input constructors whose fields are all primitive values, e.g.: InputPeerUser.
+
+    Their serialized bytes only depend on those fields and can be cached: set Immutable.cache_writes
+    to True to reuse the output of write_into until any field is reassigned.
+    """
+
+    __slots__ = ["_cache"]
+
+    cache_writes = False
+
+    def __setattr__(self, name: str, value):
+        # Reassigning a field invalidates the cached bytes
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_cache", None)
+
+    @staticmethod
+    def cached(write_into):
+        @wraps(write_into)
+        def wrapper(self, b: bytearray):
+            if not Immutable.cache_writes:
+                return write_into(self, b)
+
+            try:
+                cache = self._cache
+            except AttributeError:  # Lazily decoded and not materialized yet
+                cache = None
+
+            if cache is None:
+                start = len(b)
+                write_into(self, b)
+                object.__setattr__(self, "_cache", bytes(b[start:]))
+            else:
+                b += cache
+
+        return wrapper
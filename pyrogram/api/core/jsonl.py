@@ -0,0 +1,48 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from json import loads
+
+from .object import Encoder, Object
+
+# Compact output, one object per line
+encoder = Encoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def write_jsonl(objects, fp) -> int:
+    """Stream TL objects to a text file in JSON Lines format, one object per line.
+
+    Objects are encoded one at a time, so any iterable (e.g.: a generator paging through a chat history)
+    can be exported without keeping it all in memory. *fp* is a file opened in text mode.
+    Returns the number of lines written.
+    """
+    count = 0
+
+    for count, obj in enumerate(objects, 1):
+        fp.write(encoder.encode(obj))
+        fp.write("\n")
+
+    return count
+
+
+def read_jsonl(fp):
+    """Lazily rebuild the TL objects of a file written by write_jsonl, skipping blank lines."""
+    for line in fp:
+        if line.strip():
+            yield Object.load(loads(line))
@@ -0,0 +1,60 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+from importlib import import_module
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """A package whose attributes are imported on first access.
+
+    Generated packages (types, functions and their namespaces) map each class
+    or sub-namespace name to the module defining it, so that importing
+    pyrogram doesn't import a thousand modules upfront.
+    """
+
+    def __getattr__(self, name: str):
+        try:
+            path = self._lazy_attrs[name]
+        except KeyError:
+            raise AttributeError("module '{}' has no attribute '{}'".format(self.__name__, name)) from None
+
+        module = import_module(path, self.__name__)
+
+        # Sub-namespaces are modules themselves, everything else is a class defined inside its own module
+        value = module if path == "." + name else getattr(module, name)
+        setattr(self, name, value)
+
+        return value
+
+    def __dir__(self) -> list:
+        return sorted(set(super().__dir__()) | set(self._lazy_attrs))
+
+    @classmethod
+    def install(cls, name: str, attrs: dict):
+        module = sys.modules[name]
+        module._lazy_attrs = attrs
+        module.__all__ = list(attrs)
+
+        try:
+            module.__class__ = cls
+        except TypeError:
+            # Python < 3.5 can't change a module's class: import everything right away
+            for i in attrs:
+                cls.__getattr__(module, i)
@@ -16,36 +16,60 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
+from struct import Struct
 
 from .object import Object
-from .primitives import Int, Long
+from .primitives import Int
+from .reader import Reader
 
 
 class Message(Object):
     ID = 0x5bb8e511  # hex(crc32(b"message msg_id:long seqno:int bytes:int body:Object = Message"))
 
-    def __init__(self, body: Object, msg_id: int, seq_no: int, length: int):
+    HEADER = Struct("<qii")
+    LAZY = False
+
+    RPC_RESULT_ID = 0xf35c6d01  # rpc_result#f35c6d01
+
+    __slots__ = ["msg_id", "seq_no", "length", "body"]
+
+    def __init__(self, body: Object or bytes, msg_id: int, seq_no: int, length: int = 0):
         self.msg_id = msg_id
         self.seq_no = seq_no
         self.length = length
         self.body = body
 
     @staticmethod
-    def read(b: BytesIO, *args) -> "Message":
-        msg_id = Long.read(b)
-        seq_no = Int.read(b)
-        length = Int.read(b)
-        body = b.read(length)
+    def read(b: Reader, *args) -> "Message":
+        msg_id, seq_no, length = b.unpack(Message.HEADER)
+        end = b.tell() + length
+
+        # Ignored objects are only filtered out of what the server pushes, results are always read in full
+        ignore = b.ignore
 
-        return Message(Object.read(BytesIO(body)), msg_id, seq_no, length)
+        if ignore and Object.ID_STRUCT.unpack_from(b.view, b.offset)[0] == Message.RPC_RESULT_ID:
+            b.ignore = None
 
-    def write(self) -> bytes:
-        b = BytesIO()
+        # The body is parsed in place; seeking to its end keeps a misparsed body from shifting the next message
+        body = Object.read(b)
+        b.seek(end)
+        b.ignore = ignore
+
+        return Message(body, msg_id, seq_no, length)
+
+    @staticmethod
+    def skip(b: Reader, *args):
+        length = b.unpack(Message.HEADER)[2]
+        b.offset += length
 
-        b.write(Long(self.msg_id))
-        b.write(Int(self.seq_no))
-        b.write(Int(self.length))
-        b.write(self.body.write())
+    def write_into(self, b: bytearray):
+        b += Message.HEADER.pack(self.msg_id, self.seq_no, 0)
+        start = len(b)
 
-        return b.getvalue()
+        # Serialize the body right into the buffer and backpatch its length afterwards
+        if isinstance(self.body, (bytes, bytearray)):
+            b += self.body  # Serialized already
+        else:
+            self.body.write_into(b)
+        self.length = len(b) - start
+        b[start - 4:start] = Int(self.length)
@@ -16,33 +16,40 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
-
 from .message import Message
 from .object import Object
 from .primitives import Int
+from .reader import Reader
 
 
 class MsgContainer(Object):
     ID = 0x73f1f8dc
+    LAZY = False
+
+    __slots__ = ["messages"]
 
     def __init__(self, messages: list):
         self.messages = messages
 
     @staticmethod
-    def read(b: BytesIO, *args) -> "MsgContainer":
+    def read(b: Reader, *args) -> "MsgContainer":
         count = Int.read(b)
         return MsgContainer([Message.read(b) for _ in range(count)])
 
-    def write(self) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def skip(b: Reader, *args):
+        for _ in range(Int.read(b)):
+            Message.skip(b)
 
-        b.write(Int(self.ID, False))
+    def write_into(self, b: bytearray):
+        b += Int(self.ID, False)
 
         count = len(self.messages)
-        b.write(Int(count))
+        b += Int(count)
 
         for message in self.messages:
-            b.write(message.write())
-
-        return b.getvalue()
+            # Messages may come already serialized, e.g.: to measure them before batching
+            if isinstance(message, (bytes, bytearray)):
+                b += message
+            else:
+                message.write_into(b)
@@ -16,32 +16,194 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import OrderedDict
+from array import array
+from ast import literal_eval
 from datetime import datetime
-from io import BytesIO
+from importlib import import_module
 from json import JSONEncoder, dumps
+from struct import Struct
 
+from .reader import Reader
 from ..all import objects
 
 
+class Registry(dict):
+    """Maps constructor IDs to classes, importing each class the first time its ID is looked up"""
+
+    def __missing__(self, key: int):
+        # Unknown IDs still raise KeyError, which Vector relies on
+        path, name = objects[key].rsplit(".", 1)
+        value = self[key] = getattr(import_module("pyrogram.api." + path), name)
+
+        return value
+
+
 class Object:
-    all = {}
+    all = Registry()
+
+    # Maps the "_" value of dicts made by to_dict back to constructor IDs
+    paths = {path: i for i, path in objects.items()}
+
+    # Where the data of a lazily decoded object is, until its fields are materialized
+    __slots__ = ["_raw"]
+
+    ID_STRUCT = Struct("<I")
+
+    # Core objects set this to False: they are always decoded eagerly
+    LAZY = True
 
     @staticmethod
-    def read(b: BytesIO, *args):
-        return Object.all[int.from_bytes(b.read(4), "little")].read(b, *args)
+    def read(b: Reader, *args):
+        cls = Object.all[b.unpack(Object.ID_STRUCT)[0]]
+
+        if b.ignore and cls.ID in b.ignore:
+            cls.skip(b)
+            return None
+
+        if b.lazy and cls.LAZY and cls.__slots__:
+            return cls.defer(b)
+
+        return cls.read(b, *args)
+
+    @staticmethod
+    def skip(b: Reader, *args):
+        # Hot path of lazy decoding: the ID is unpacked in place instead of going through Reader.unpack
+        start = b.offset = b.offset + 4
+        cls = Object.all[Object.ID_STRUCT.unpack_from(b.view, start - 4)[0]]
+
+        if b.lazy:
+            # Record where the object ends, so that deferring it later needs no skipping
+            extents = b.extents
+            i = len(extents.starts)
+            extents.starts.append(start)
+            extents.ends.append(0)
+
+            cls.skip(b, *args)
+            extents.ends[i] = b.offset
+        else:
+            cls.skip(b, *args)
+
+    @classmethod
+    def defer(cls, b: Reader) -> "Object":
+        # Only the position of the object is kept; the data is stepped over without decoding it
+        obj = cls.__new__(cls)
+        obj._raw = (b.view, b.offset, b.extents, b.ignore)
+
+        end = b.extents.end(b.offset)
+
+        if end is None:
+            cls.skip(b)
+        else:
+            b.offset = end
+
+        return obj
+
+    def materialize(self):
+        # Threads can race on the first read: each one decodes the same fields, and _raw only goes once all of them
+        # are set, so that a field is always found either set or still to be decoded
+        try:
+            view, offset, extents, ignore = self._raw
+        except AttributeError:
+            return
+
+        obj = self.read(Reader(view, offset, True, extents, ignore))
+
+        # Fields assigned before the first read keep their new value
+        for attr in self.__slots__:
+            try:
+                object.__getattribute__(self, attr)
+            except AttributeError:
+                setattr(self, attr, getattr(obj, attr))
+
+        try:
+            del self._raw
+        except AttributeError:
+            pass
 
     def write(self, *args) -> bytes:
+        b = bytearray()
+        self.write_into(b)
+
+        return bytes(b)
+
+    def write_into(self, b: bytearray):
         pass
 
+    @staticmethod
+    def dump(value):
+        # Fields of generic type (Object, X) can hold anything: Objects, lists, bare values
+        if isinstance(value, Object):
+            return value.to_dict()
+        elif isinstance(value, list):
+            return [Object.dump(i) for i in value]
+        else:
+            return value
+
+    @staticmethod
+    def load(value):
+        if isinstance(value, dict) and "_" in value:
+            return Object.all[Object.paths[value["_"]]].from_dict(value)
+        elif isinstance(value, list):
+            return [Object.load(i) for i in value]
+        else:
+            return value
+
+    @staticmethod
+    def load_bytes(value):
+        # JSON has no bytes: Encoder stores them as their repr
+        return literal_eval(value) if isinstance(value, str) else value
+
+    def to_dict(self) -> dict:
+        # Generated types have their own, faster to_dict; this one serves core and Pyrogram types
+        path = objects.get(getattr(self, "ID", None), "")
+        items = ((attr, getattr(self, attr)) for attr in self.__slots__)
+
+        if "pyrogram" in path:
+            # Pyrogram types leave out unset fields
+            return {attr: Object.dump(value) for attr, value in items if value is not None}
+
+        d = {"_": path}
+        d.update((attr, Object.dump(value)) for attr, value in items)
+
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Object":
+        return cls(**{k: Object.load(v) for k, v in d.items() if k != "_"})
+
+    def __reduce_ex__(self, protocol: int):
+        # Generated types are pickled as their TL encoding, decoded again on unpickling: the payload stays close to
+        # the wire size. Everything else is pickled field by field: Pyrogram types hold values with no TL encoding
+        # (e.g.: datetime) and core objects have no matching read/write pair (e.g.: Message, FutureSalt, Template).
+        path = objects.get(getattr(self, "ID", None), "")
+
+        if not path.startswith(("types.", "functions.")) or path.startswith("types.pyrogram."):
+            return super().__reduce_ex__(protocol)
+
+        return unpickle, (self.write(),)
+
     def __str__(self) -> str:
         return dumps(self, cls=Encoder, indent=4)
 
     def __bool__(self) -> bool:
         return True
 
+    def __repr__(self) -> str:
+        # Generated types have their own __repr__; this one serves core types
+        return "{}({})".format(
+            objects.get(getattr(self, "ID", None), type(self).__name__),
+            ", ".join("{}={!r}".format(attr, getattr(self, attr)) for attr in self.__slots__)
+        )
+
     def __eq__(self, other) -> bool:
-        return self.__dict__ == other.__dict__
+        if type(other) is not type(self):
+            return NotImplemented
+
+        for attr in self.__slots__:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+
+        return True
 
     def __len__(self) -> int:
         return len(self.write())
@@ -52,30 +214,29 @@ class Object:
     def __getitem__(self, item):
         return getattr(self, item)
 
+    def __getattr__(self, name: str):
+        # Only reached for unset attributes, which is the case for every field of a lazy object
+        if name in self.__slots__:
+            if hasattr(self, "_raw"):
+                self.materialize()
 
-def remove_none(obj):
-    if isinstance(obj, (list, tuple, set)):
-        return type(obj)(remove_none(x) for x in obj if x is not None)
-    elif isinstance(obj, dict):
-        return type(obj)((remove_none(k), remove_none(v)) for k, v in obj.items() if k is not None and v is not None)
-    else:
-        return obj
+            # Set by now, possibly by another thread that materialized the object meanwhile
+            return object.__getattribute__(self, name)
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+
+def unpickle(data: bytes) -> Object:
+    return Object.read(Reader(data))
 
 
 class Encoder(JSONEncoder):
     def default(self, o: Object):
-        try:
-            content = o.__dict__
-        except AttributeError:
-            if isinstance(o, datetime):
-                return o.strftime("%d-%b-%Y %H:%M:%S")
-            else:
-                return repr(o)
-
-        if "pyrogram" in objects.get(getattr(o, "ID", "")):
-            return remove_none(OrderedDict([i for i in content.items()]))
+        if isinstance(o, Object):
+            return o.to_dict()
+        elif isinstance(o, datetime):
+            return o.strftime("%d-%b-%Y %H:%M:%S")
+        elif isinstance(o, array):
+            return o.tolist()
         else:
-            return OrderedDict(
-                [("_", objects.get(getattr(o, "ID", None), None))]
-                + [i for i in content.items()]
-            )
+            return repr(o)
@@ -16,19 +16,24 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
 
 from ..object import Object
+from ..reader import Reader
 
 
 class BoolFalse(Object):
     ID = 0xbc799737
+    LAZY = False
     value = False
 
     @classmethod
     def read(cls, *args) -> bool:
         return cls.value
 
+    @staticmethod
+    def skip(*args):
+        pass
+
     def __new__(cls) -> bytes:
         return int.to_bytes(cls.ID, 4, "little")
 
@@ -40,8 +45,12 @@ class BoolTrue(BoolFalse):
 
 class Bool(Object):
     @classmethod
-    def read(cls, b: BytesIO) -> bool:
+    def read(cls, b: Reader) -> bool:
         return int.from_bytes(b.read(4), "little") == BoolTrue.ID
 
+    @staticmethod
+    def skip(b: Reader, *args):
+        b.offset += 4
+
     def __new__(cls, value: bool) -> BoolTrue or BoolFalse:
         return BoolTrue() if value else BoolFalse()
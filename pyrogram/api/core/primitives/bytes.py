@@ -16,26 +16,55 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
-
 from ..object import Object
+from ..reader import Reader
 
 
 class Bytes(Object):
     @staticmethod
-    def read(b: BytesIO, *args) -> bytes:
-        length = int.from_bytes(b.read(1), "little")
+    def read_view(b: Reader) -> memoryview:
+        length = b.read(1)[0]
 
         if length <= 253:
             x = b.read(length)
-            b.read(-(length + 1) % 4)
+            b.seek(-(length + 1) % 4, 1)
         else:
             length = int.from_bytes(b.read(3), "little")
             x = b.read(length)
-            b.read(-length % 4)
+            b.seek(-length % 4, 1)
 
         return x
 
+    @staticmethod
+    def read(b: Reader, *args) -> bytes:
+        # Copy the value out of the shared buffer only once, here
+        return Bytes.read_view(b).tobytes()
+
+    @staticmethod
+    def skip(b: Reader, *args):
+        length = b.view[b.offset]
+
+        # Length prefix, value and padding to 4 bytes
+        if length <= 253:
+            b.offset += (length + 4) & ~3
+        else:
+            length = int.from_bytes(b.view[b.offset + 1:b.offset + 4], "little")
+            b.offset += (length + 7) & ~3
+
+    @staticmethod
+    def write_into(b: bytearray, value: bytes):
+        length = len(value)
+
+        if length <= 253:
+            b.append(length)
+            b += value
+            b += bytes(-(length + 1) % 4)
+        else:
+            b.append(254)
+            b += int.to_bytes(length, 3, "little")
+            b += value
+            b += bytes(-length % 4)
+
     def __new__(cls, value: bytes) -> bytes:
         length = len(value)
 
@@ -16,16 +16,20 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
 from struct import unpack, pack
 
 from ..object import Object
+from ..reader import Reader
 
 
 class Double(Object):
     @staticmethod
-    def read(b: BytesIO, *args) -> float:
+    def read(b: Reader, *args) -> float:
         return unpack("d", b.read(8))[0]
 
+    @staticmethod
+    def skip(b: Reader, *args):
+        b.offset += 8
+
     def __new__(cls, value: float) -> bytes:
         return pack("d", value)
@@ -16,17 +16,24 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
+
+from struct import Struct
 
 from ..object import Object
+from ..reader import Reader
 
 
 class Int(Object):
     SIZE = 4
+    STRUCTS = (Struct("<I"), Struct("<i"))  # Unsigned, signed
 
     @classmethod
-    def read(cls, b: BytesIO, signed: bool = True) -> int:
-        return int.from_bytes(b.read(cls.SIZE), "little", signed=signed)
+    def read(cls, b: Reader, signed: bool = True) -> int:
+        return b.unpack(cls.STRUCTS[signed])[0]
+
+    @classmethod
+    def skip(cls, b: Reader, *args):
+        b.offset += cls.SIZE
 
     def __new__(cls, value: int, signed: bool = True) -> bytes:
         return int.to_bytes(value, cls.SIZE, "little", signed=signed)
@@ -34,6 +41,7 @@ class Int(Object):
 
 class Long(Int):
     SIZE = 8
+    STRUCTS = (Struct("<Q"), Struct("<q"))
 
     # TODO: PyCharm can't infer types when overriding parent's __new__ and is showing unnecessary warnings.
     # Add this to shut warnings down
@@ -44,6 +52,10 @@ class Long(Int):
 class Int128(Int):
     SIZE = 16
 
+    @classmethod
+    def read(cls, b: Reader, signed: bool = True) -> int:
+        return int.from_bytes(b.read(cls.SIZE), "little", signed=signed)
+
 
-class Int256(Int):
+class Int256(Int128):
     SIZE = 32
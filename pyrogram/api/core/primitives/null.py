@@ -16,17 +16,22 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
 
 from ..object import Object
+from ..reader import Reader
 
 
 class Null(Object):
     ID = 0x56730bcc
+    LAZY = False
 
     @staticmethod
-    def read(b: BytesIO, *args) -> None:
+    def read(b: Reader, *args) -> None:
         return None
 
+    @staticmethod
+    def skip(b: Reader, *args):
+        pass
+
     def __new__(cls) -> bytes:
         return int.to_bytes(cls.ID, 4, "little")
@@ -16,15 +16,18 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
-
 from . import Bytes
+from ..reader import Reader
 
 
 class String(Bytes):
     @staticmethod
-    def read(b: BytesIO, *args) -> str:
-        return super(String, String).read(b).decode()
+    def read(b: Reader, *args) -> str:
+        return str(Bytes.read_view(b), "utf-8")
+
+    @staticmethod
+    def write_into(b: bytearray, value: str):
+        Bytes.write_into(b, value.encode())
 
     def __new__(cls, value: str) -> bytes:
         return super().__new__(cls, value.encode())
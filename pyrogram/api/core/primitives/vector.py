@@ -16,39 +16,94 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from io import BytesIO
 
-from . import Int
+import sys
+from array import array
+
+from . import Int, Long
 from ..object import Object
+from ..reader import Reader
+from ...all import objects
 
 
 class Vector(Object):
     ID = 0x1cb5c415
+    LAZY = False
+
+    # Vectors of ints and longs are (de)serialized in bulk, as arrays of these types
+    TYPECODES = {Int: "i", Long: "q"}
+
+    # Set to True to get vectors of ints and longs as array.array instead of lists
+    as_array = False
 
-    # Method added to handle the special case when a query returns a bare Vector (of Ints);
-    # i.e., RpcResult body starts with 0x1cb5c415 (Vector Id) - e.g., messages.GetMessagesViews.
     @staticmethod
-    def _read(b: BytesIO) -> Object or int:
-        try:
-            return Object.read(b)
-        except KeyError:
-            b.seek(-4, 1)
-            return Int.read(b)
+    def read_bulk(b: Reader, count: int, typecode: str) -> list or array:
+        values = array(typecode)
+        values.frombytes(b.read(count * values.itemsize))
+
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        return values if Vector.as_array else values.tolist()
 
     @staticmethod
-    def read(b: BytesIO, t: Object = None) -> list:
-        return [
-            t.read(b) if t
-            else Vector._read(b)
-            for _ in range(Int.read(b))
-        ]
+    def read(b: Reader, t: Object = None) -> list or array:
+        count = Int.read(b)
+
+        if t is None:
+            # Handle the special case when a query returns a bare Vector (of Ints);
+            # i.e., RpcResult body starts with 0x1cb5c415 (Vector Id) - e.g., messages.GetMessagesViews.
+            # Elements are all of the same type, so looking at the first one is enough
+            if count and Object.ID_STRUCT.unpack_from(b.view, b.offset)[0] not in objects:
+                return Vector.read_bulk(b, count, "i")
+
+            values = [Object.read(b) for _ in range(count)]
+
+            # Ignored objects are read as None and left out
+            return [i for i in values if i is not None] if b.ignore else values
+
+        if t in Vector.TYPECODES:
+            return Vector.read_bulk(b, count, Vector.TYPECODES[t])
+
+        return [t.read(b) for _ in range(count)]
+
+    @staticmethod
+    def skip(b: Reader, t: Object = None):
+        count = Int.read(b)
+
+        if t is None:
+            if count and Object.ID_STRUCT.unpack_from(b.view, b.offset)[0] not in objects:
+                b.offset += count * 4
+            else:
+                for _ in range(count):
+                    Object.skip(b)
+        elif issubclass(t, Int):
+            b.offset += count * t.SIZE
+        else:
+            for _ in range(count):
+                t.skip(b)
+
+    @staticmethod
+    def write_into(b: bytearray, value: list or array, t: Object = None):
+        b += Int(Vector.ID, False)
+        b += Int(len(value))
+
+        if t in Vector.TYPECODES:
+            values = array(Vector.TYPECODES[t], value)
+
+            if sys.byteorder == "big":
+                values.byteswap()
+
+            b += values
+        elif t:
+            for i in value:
+                b += t(i)
+        else:
+            for i in value:
+                i.write_into(b)
 
     def __new__(cls, value: list, t: Object = None) -> bytes:
-        return b"".join(
-            [Int(cls.ID, False), Int(len(value))]
-            + [
-                t(i) if t
-                else i.write()
-                for i in value
-            ]
-        )
+        b = bytearray()
+        Vector.write_into(b, value, t)
+
+        return bytes(b)
@@ -0,0 +1,99 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from bisect import bisect_left
+from struct import Struct
+
+
+class Extents:
+    """Start and end offsets of the objects a lazy Reader has stepped over.
+
+    Objects are recorded in order of appearance, i.e.: sorted by start offset,
+    into two compact arrays that are searched with bisect.
+    """
+
+    __slots__ = ["starts", "ends"]
+
+    def __init__(self):
+        self.starts = array("I")
+        self.ends = array("I")
+
+    def end(self, start: int) -> int or None:
+        i = bisect_left(self.starts, start)
+
+        if i < len(self.starts) and self.starts[i] == start:
+            return self.ends[i]
+
+
+class Reader:
+    """A BytesIO-like cursor over a memoryview.
+
+    Reads are offset-based and return memoryview slices of the underlying
+    buffer, so nothing is copied until a value is actually built out of it.
+
+    A lazy Reader makes Object.read return objects whose fields are decoded
+    only when first accessed. The extents of the objects it steps over are
+    shared by all the readers of the same buffer, so that no object is skipped
+    twice.
+
+    Objects whose constructor ID is in ignore are skipped and read as None
+    (and left out of vectors).
+    """
+
+    __slots__ = ["view", "offset", "lazy", "extents", "ignore"]
+
+    def __init__(self,
+                 data: bytes,
+                 offset: int = 0,
+                 lazy: bool = False,
+                 extents: Extents = None,
+                 ignore: frozenset = None):
+        self.view = memoryview(data)
+        self.offset = offset
+        self.lazy = lazy
+        self.extents = extents or Extents() if lazy else None
+        self.ignore = ignore
+
+    def read(self, n: int = -1) -> memoryview:
+        start = self.offset
+        end = self.offset = start + n if n >= 0 else len(self.view)
+
+        return self.view[start:end]
+
+    def unpack(self, s: Struct) -> tuple:
+        values = s.unpack_from(self.view, self.offset)
+        self.offset += s.size
+
+        return values
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self.offset
+        elif whence == 2:
+            offset += len(self.view)
+
+        self.offset = offset
+
+        return offset
+
+    def tell(self) -> int:
+        return self.offset
+
+    def getvalue(self) -> bytes:
+        return self.view.tobytes()
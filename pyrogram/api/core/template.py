@@ -0,0 +1,136 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from struct import Struct
+
+from .object import Object
+from .primitives import Bytes
+
+
+class Template(Object):
+    """A function serialized once, to be sent many times with a few fields changed.
+
+    Fixed-width int and long fields are patched in place in the serialized bytes, and the last field, if of type
+    bytes, can be kept apart and appended on write: sending the same request in a loop (e.g.: file parts) does not
+    serialize it again each time.
+
+    Patching changes the template itself. Sessions copy its bytes as soon as it is sent (or queued, with send_async),
+    and resend that copy if needed: the template can be patched again right away, even while earlier requests made
+    from it are still waiting for their results. Anything else that keeps a template around must copy it, e.g.: with
+    :meth:`write`, before patching it again.
+
+    Args:
+        query (:obj:`Object`):
+            The function to send. Its other fields are serialized once and must not change afterwards.
+
+        *fields (``str``):
+            Names of the int and long fields that change between sends.
+
+        tail (``str``, optional):
+            Name of a bytes field that changes between sends. It must be the last field of the function.
+
+    Example:
+        .. code-block:: python
+
+            template = Template(functions.upload.GetFile(location, 0, limit), "offset")
+
+            for offset in range(0, size, limit):
+                session.send(template.patch(offset=offset))
+    """
+
+    LAZY = False
+
+    __slots__ = ["query", "head", "offsets", "tail_name", "tail"]
+
+    STRUCTS = {4: Struct("<i"), 8: Struct("<q")}
+
+    def __init__(self, query: Object, *fields: str, tail: str = None):
+        self.query = query
+        self.offsets = {name: self.locate(query, name) for name in fields}
+        self.tail_name = tail
+        self.tail = b""
+
+        if tail is not None:
+            self.tail = getattr(query, tail)
+
+            try:
+                setattr(query, tail, b"")
+                empty = query.write()
+                setattr(query, tail, b"\x01")
+                one = query.write()
+            except Exception:  # Not a bytes field
+                empty = one = b""
+            finally:
+                setattr(query, tail, self.tail)
+
+            # An empty bytes value is serialized as 4 zero bytes; anything after it would move
+            if not empty.endswith(bytes(4)) or one[:-4] != empty[:-4]:
+                raise ValueError("'{}' is not the last bytes field of {}".format(tail, type(query).__name__))
+
+            self.head = bytearray(empty[:-4])
+        else:
+            self.head = bytearray(query.write())
+
+    @staticmethod
+    def locate(query: Object, name: str) -> tuple:
+        # The field is found by serializing the function with two values that differ in every byte
+        value = getattr(query, name)
+
+        try:
+            setattr(query, name, 0)
+            zero = query.write()
+            setattr(query, name, -1)
+            ones = query.write()
+        except Exception:  # Not even a number
+            zero = ones = b""
+        finally:
+            setattr(query, name, value)
+
+        diff = [i for i, (x, y) in enumerate(zip(zero, ones)) if x != y]
+        size = len(diff) if diff and diff[-1] - diff[0] + 1 == len(diff) and len(zero) == len(ones) else 0
+
+        # Unset optional fields would move the others once set: they can't be patched either
+        if value is None or size not in Template.STRUCTS:
+            raise ValueError("'{}' is not an int or long field of {}".format(name, type(query).__name__))
+
+        # The size, not the Struct itself, is kept: Structs can't be pickled
+        return size, diff[0]
+
+    def patch(self, **values) -> "Template":
+        """Change the value of some fields and return the template itself, ready to be sent."""
+        for name, value in values.items():
+            if name == self.tail_name:
+                self.tail = value
+            else:
+                size, offset = self.offsets[name]
+                Template.STRUCTS[size].pack_into(self.head, offset, value)
+
+            # Keep the function in sync, for logs and error messages
+            setattr(self.query, name, value)
+
+        return self
+
+    def write_into(self, b: bytearray):
+        b += self.head
+
+        if self.tail_name is not None:
+            Bytes.write_into(b, self.tail)
+
+    def __repr__(self) -> str:
+        return "Template({!r})".format(self.query)
@@ -30,6 +30,8 @@ import sys
 import tempfile
 import threading
 import time
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
 from configparser import ConfigParser
 from datetime import datetime
 from hashlib import sha256, md5
@@ -39,14 +41,14 @@ from threading import Event, Thread
 
 import pyrogram
 from pyrogram.api import functions, types
-from pyrogram.api.core import Object
+from pyrogram.api.core import Object, Template
 from pyrogram.api.errors import (
     PhoneMigrate, NetworkMigrate, PhoneNumberInvalid,
     PhoneNumberUnoccupied, PhoneCodeInvalid, PhoneCodeHashEmpty,
     PhoneCodeExpired, PhoneCodeEmpty, SessionPasswordNeeded,
     PasswordHashInvalid, FloodWait, PeerIdInvalid, FilePartMissing,
     ChatAdminRequired, FirstnameInvalid, PhoneNumberBanned,
-    VolumeLocNotFound, UserMigrate, FileIdInvalid)
+    VolumeLocNotFound, UserMigrate, FileIdInvalid, InternalServerError)
 from pyrogram.crypto import AES
 from pyrogram.session import Auth, Session
 from pyrogram.session.internals import MsgId
@@ -127,6 +129,21 @@ class Client:
         workdir (``str``, optional):
             Define a custom working directory. The working directory is the location in your filesystem
             where Pyrogram will store your session files. Defaults to "." (current directory).
+
+        lazy_decoding (``bool``, optional):
+            Pass True to decode incoming objects lazily: each object's fields are only decoded the first time
+            one of them is accessed. This saves CPU time and memory when handlers only look at a few fields of
+            large results, at the cost of keeping the raw data around until then. Code that reads most fields of
+            every object anyway (e.g.: a full history scan) gets slower instead, by about a quarter.
+            Defaults to False.
+
+        allowed_updates (``list``, optional):
+            Pass a list of Update types (e.g.: *[types.UpdateNewMessage]*) or constructor IDs to only receive
+            those updates. Any other update sent by the server is skipped without being decoded.
+
+        ignored_updates (``list``, optional):
+            Pass a list of Update types (e.g.: *[types.UpdateUserStatus, types.UpdateUserTyping]*) or constructor
+            IDs you are not interested in. They are skipped without being decoded and never reach your handlers.
     """
 
     INVITE_LINK_RE = re.compile(r"^(?:https?://)?(?:t\.me/joinchat/)([\w-]+)$")
@@ -161,7 +178,10 @@ class Client:
                  first_name: str = None,
                  last_name: str = None,
                  workers: int = 4,
-                 workdir: str = "."):
+                 workdir: str = ".",
+                 lazy_decoding: bool = False,
+                 allowed_updates: list = None,
+                 ignored_updates: list = None):
         self.session_name = session_name
         self.api_id = int(api_id) if api_id else None
         self.api_hash = api_hash
@@ -177,6 +197,9 @@ class Client:
 
         self.workers = workers
         self.workdir = workdir
+        self.lazy_decoding = lazy_decoding
+        self.allowed_updates = allowed_updates
+        self.ignored_updates = ignored_updates
 
         self.token = None
 
@@ -185,6 +208,9 @@ class Client:
         self.user_id = None
         self.date = None
 
+        # Future salts of the auth key, shared by the sessions using it and saved in the session file
+        self.salts = []
+
         self.rnd_id = MsgId
 
         self.peers_by_id = {}
@@ -300,7 +326,11 @@ class Client:
             self.proxy,
             self.auth_key,
             self.api_id,
-            client=self
+            client=self,
+            lazy_decoding=self.lazy_decoding,
+            allowed_updates=self.allowed_updates,
+            ignored_updates=self.ignored_updates,
+            salts=self.salts
         )
 
         self.session.start()
@@ -395,6 +425,7 @@ class Client:
 
             self.dc_id = e.x
             self.auth_key = Auth(self.dc_id, self.test_mode, self.proxy).create()
+            self.salts = []
 
             self.session = Session(
                 self.dc_id,
@@ -402,7 +433,11 @@ class Client:
                 self.proxy,
                 self.auth_key,
                 self.api_id,
-                client=self
+                client=self,
+                lazy_decoding=self.lazy_decoding,
+                allowed_updates=self.allowed_updates,
+                ignored_updates=self.ignored_updates,
+                salts=self.salts
             )
 
             self.session.start()
@@ -443,6 +478,7 @@ class Client:
 
                 self.dc_id = e.x
                 self.auth_key = Auth(self.dc_id, self.test_mode, self.proxy).create()
+                self.salts = []
 
                 self.session = Session(
                     self.dc_id,
@@ -450,7 +486,11 @@ class Client:
                     self.proxy,
                     self.auth_key,
                     self.api_id,
-                    client=self
+                    client=self,
+                    lazy_decoding=self.lazy_decoding,
+                    allowed_updates=self.allowed_updates,
+                    ignored_updates=self.ignored_updates,
+                    salts=self.salts
                 )
                 self.session.start()
 
@@ -879,6 +919,120 @@ class Client:
 
         return r
 
+    def send_async(self, data: Object):
+        """Use this method to send Raw Function queries without waiting for their results.
+
+        Like :meth:`send`, but it returns right away, so that many queries can be in flight at the same time.
+        Failed queries are not retried.
+
+        Args:
+            data (``Object``):
+                The API Scheme function filled with proper arguments.
+
+        Returns:
+            A :obj:`Future <concurrent.futures.Future>`. Its ``result()`` returns the query result or raises
+            :class:`Error <pyrogram.Error>`, and it can be cancelled while the query is pending.
+
+        Raises:
+            ``ConnectionError`` if the client has not been started.
+        """
+        if not self.is_started:
+            raise ConnectionError("Client has not been started")
+
+        future = self.session.send_async(data)
+        future.add_done_callback(self.fetch_result_peers)
+
+        return future
+
+    def send_many(self, requests, window: int = 10) -> list:
+        """Use this method to send many Raw Function queries, keeping up to *window* of them in flight at once.
+
+        Queries are pipelined on the session instead of waiting for each result before sending the next query, so
+        bulk jobs (e.g.: fetching the history of many chats) are not bound by the network round trip time.
+
+        A query failing with FloodWait pauses sending for the required time and is then sent again; other queries
+        still in flight are not affected. Network errors and timeouts are retried like :meth:`send` does.
+
+        Args:
+            requests (``iterable``):
+                The API Scheme functions to send.
+
+            window (``int``, optional):
+                How many queries can wait for their results at the same time. Defaults to 10.
+
+        Returns:
+            A list with the result of each query, in the same order as *requests*. Failed queries have their
+            :class:`Error <pyrogram.Error>` (or other exception) in place of the result.
+
+        Raises:
+            ``ConnectionError`` if the client has not been started.
+            ``ValueError`` if *window* is lower than 1.
+        """
+        if not self.is_started:
+            raise ConnectionError("Client has not been started")
+
+        if window < 1:
+            raise ValueError("window must be at least 1, got {}".format(window))
+
+        requests = list(requests)
+        results = [None] * len(requests)
+        retries = [Session.MAX_RETRIES] * len(requests)
+
+        queue = deque(range(len(requests)))
+        pending = {}  # Future -> index of its request
+        resume = 0  # Nothing new is sent before this time (set by FloodWait and retries)
+
+        while queue or pending:
+            now = time.monotonic()
+
+            while queue and len(pending) < window and now >= resume:
+                # Queries being retried are not sent again until the session has reconnected
+                self.session.is_connected.wait(self.session.WAIT_TIMEOUT)
+                now = time.monotonic()
+
+                i = queue.popleft()
+                pending[self.send_async(requests[i])] = i
+
+            if not pending:
+                time.sleep(resume - now)
+                continue
+
+            done, _ = wait(
+                pending,
+                timeout=resume - now if queue and resume > now else None,
+                return_when=FIRST_COMPLETED
+            )
+
+            for future in done:
+                i = pending.pop(future)
+
+                try:
+                    results[i] = future.result()
+                except FloodWait as e:
+                    log.warning("{}: {}".format(type(requests[i]).__name__, e.MESSAGE.format(x=e.x)))
+                    resume = max(resume, time.monotonic() + e.x)
+                    queue.appendleft(i)
+                except (OSError, TimeoutError, InternalServerError) as e:
+                    if retries[i] == 0:
+                        results[i] = e
+                    else:
+                        retries[i] -= 1
+                        resume = max(resume, time.monotonic() + 0.5)
+                        queue.appendleft(i)
+                except Exception as e:
+                    results[i] = e
+
+        return results
+
+    def fetch_result_peers(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        r = future.result()
+
+        self.fetch_peers(getattr(r, "users", []))
+        self.fetch_peers(getattr(r, "chats", []))
+
     def load_config(self):
         parser = ConfigParser()
         parser.read("config.ini")
@@ -915,12 +1069,14 @@ class Client:
             self.dc_id = 1
             self.date = 0
             self.auth_key = Auth(self.dc_id, self.test_mode, self.proxy).create()
+            self.salts = []
         else:
             self.dc_id = s["dc_id"]
             self.test_mode = s["test_mode"]
             self.auth_key = base64.b64decode("".join(s["auth_key"]))
             self.user_id = s["user_id"]
             self.date = s.get("date", 0)
+            self.salts = utils.load_salts(s.get("salts", []))
 
             for k, v in s.get("peers_by_id", {}).items():
                 self.peers_by_id[int(k)] = utils.get_input_peer(int(k), v)
@@ -950,7 +1106,8 @@ class Client:
                     test_mode=self.test_mode,
                     auth_key=auth_key,
                     user_id=self.user_id,
-                    date=self.date
+                    date=self.date,
+                    salts=utils.dump_salts(self.salts)
                 ),
                 f,
                 indent=4
@@ -2608,9 +2765,26 @@ class Client:
         file_id = file_id or self.rnd_id()
         md5_sum = md5() if not is_big and not is_missing_part else None
 
-        session = Session(self.dc_id, self.test_mode, self.proxy, self.auth_key, self.api_id)
+        session = Session(self.dc_id, self.test_mode, self.proxy, self.auth_key, self.api_id, salts=self.salts)
         session.start()
 
+        if is_big:
+            rpc = functions.upload.SaveBigFilePart(
+                file_id=file_id,
+                file_part=file_part,
+                file_total_parts=file_total_parts,
+                bytes=b""
+            )
+        else:
+            rpc = functions.upload.SaveFilePart(
+                file_id=file_id,
+                file_part=file_part,
+                bytes=b""
+            )
+
+        # Serialized once: each part only patches file_part and appends its bytes
+        rpc = Template(rpc, "file_part", tail="bytes")
+
         try:
             with open(path, "rb") as f:
                 f.seek(part_size * file_part)
@@ -2623,21 +2797,7 @@ class Client:
                             md5_sum = "".join([hex(i)[2:].zfill(2) for i in md5_sum.digest()])
                         break
 
-                    if is_big:
-                        rpc = functions.upload.SaveBigFilePart(
-                            file_id=file_id,
-                            file_part=file_part,
-                            file_total_parts=file_total_parts,
-                            bytes=chunk
-                        )
-                    else:
-                        rpc = functions.upload.SaveFilePart(
-                            file_id=file_id,
-                            file_part=file_part,
-                            bytes=chunk
-                        )
-
-                    assert self.send(rpc), "Couldn't upload file"
+                    assert session.send(rpc.patch(file_part=file_part, bytes=chunk)), "Couldn't upload file"
 
                     if is_missing_part:
                         return
@@ -2709,7 +2869,8 @@ class Client:
                 self.test_mode,
                 self.proxy,
                 self.auth_key,
-                self.api_id
+                self.api_id,
+                salts=self.salts
             )
 
             session.start()
@@ -2731,14 +2892,18 @@ class Client:
         offset = 0
         file_name = ""
 
+        # Serialized once: each chunk only patches the offset
+        get_file = Template(
+            functions.upload.GetFile(
+                location=location,
+                offset=offset,
+                limit=limit
+            ),
+            "offset"
+        )
+
         try:
-            r = session.send(
-                functions.upload.GetFile(
-                    location=location,
-                    offset=offset,
-                    limit=limit
-                )
-            )
+            r = session.send(get_file)
 
             if isinstance(r, types.upload.File):
                 with tempfile.NamedTemporaryFile("wb", delete=False) as f:
@@ -2759,13 +2924,7 @@ class Client:
                         if progress:
                             progress(min(offset, size), size)
 
-                        r = session.send(
-                            functions.upload.GetFile(
-                                location=location,
-                                offset=offset,
-                                limit=limit
-                            )
-                        )
+                        r = session.send(get_file.patch(offset=offset))
 
             elif isinstance(r, types.upload.FileCdnRedirect):
                 cdn_session = Session(
@@ -2779,18 +2938,21 @@ class Client:
 
                 cdn_session.start()
 
+                get_cdn_file = Template(
+                    functions.upload.GetCdnFile(
+                        file_token=r.file_token,
+                        offset=offset,
+                        limit=limit
+                    ),
+                    "offset"
+                )
+
                 try:
                     with tempfile.NamedTemporaryFile("wb", delete=False) as f:
                         file_name = f.name
 
                         while True:
-                            r2 = cdn_session.send(
-                                functions.upload.GetCdnFile(
-                                    file_token=r.file_token,
-                                    offset=offset,
-                                    limit=limit
-                                )
-                            )
+                            r2 = cdn_session.send(get_cdn_file.patch(offset=offset))
 
                             if isinstance(r2, types.upload.CdnFileReuploadNeeded):
                                 try:
@@ -94,6 +94,7 @@ class Syncer:
                 auth_key=auth_key,
                 user_id=client.user_id,
                 date=int(time.time()),
+                salts=utils.dump_salts(client.salts),
                 peers_by_id={
                     k: getattr(v, "access_hash", None)
                     for k, v in client.peers_by_id.copy().items()
@@ -17,8 +17,10 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from base64 import b64decode, b64encode
+from datetime import datetime
 
 from pyrogram.api import types
+from pyrogram.api.core import FutureSalt
 
 
 def get_peer_id(input_peer) -> int:
@@ -48,6 +50,15 @@ def get_offset_date(dialogs):
         return 0
 
 
+def dump_salts(salts: list) -> list:
+    # Saved as [valid_since, valid_until, salt], with unix timestamps
+    return [[int(i.valid_since.timestamp()), int(i.valid_until.timestamp()), i.salt] for i in salts]
+
+
+def load_salts(salts: list) -> list:
+    return [FutureSalt(datetime.fromtimestamp(i[0]), datetime.fromtimestamp(i[1]), i[2]) for i in salts]
+
+
 def decode(s: str) -> bytes:
     s = b64decode(s + "=" * (-len(s) % 4), "-_")
     r = b""
@@ -19,11 +19,10 @@
 import logging
 import time
 from hashlib import sha1
-from io import BytesIO
 from os import urandom
 
 from pyrogram.api import functions, types
-from pyrogram.api.core import Object, Long, Int
+from pyrogram.api.core import Object, Long, Int, Reader
 from pyrogram.connection import Connection
 from pyrogram.crypto import AES, RSA, Prime
 from .internals import MsgId, DataCenter
@@ -54,22 +53,24 @@ class Auth:
 
     @staticmethod
     def pack(data: Object) -> bytes:
+        data = data.write()
+
         return (
             bytes(8)
             + Long(MsgId())
-            + Int(len(data.write()))
-            + data.write()
+            + Int(len(data))
+            + data
         )
 
     @staticmethod
-    def unpack(b: BytesIO):
+    def unpack(b: Reader):
         b.seek(20)  # Skip auth_key_id (8), message_id (8) and message_length (4)
         return Object.read(b)
 
     def send(self, data: Object):
         data = self.pack(data)
         self.connection.send(data)
-        response = BytesIO(self.connection.recv())
+        response = Reader(self.connection.recv())
 
         return self.unpack(response)
 
@@ -166,7 +167,7 @@ class Auth:
                 answer_with_hash = AES.ige_decrypt(encrypted_answer, tmp_aes_key, tmp_aes_iv)
                 answer = answer_with_hash[20:]
 
-                server_dh_inner_data = Object.read(BytesIO(answer))
+                server_dh_inner_data = Object.read(Reader(answer))
 
                 log.debug("Done decrypting answer")
 
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from .ack_manager import AckManager
 from .data_center import DataCenter
 from .msg_factory import MsgFactory
-from .msg_id import MsgId
+from .msg_id import MsgId, SessionMsgId
+from .replay_window import ReplayWindow
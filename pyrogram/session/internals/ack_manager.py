@@ -0,0 +1,54 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+
+
+class AckManager:
+    """The ids of the server messages waiting to be acknowledged.
+
+    Net workers add ids as messages arrive, while the SendThread takes them to send them with the next packet.
+    """
+
+    def __init__(self):
+        self.msg_ids = set()
+        self.lock = Lock()
+
+    def add(self, msg_id: int) -> bool:
+        """Add a msg_id; returns False if it was already pending (i.e.: the server sent the message again)."""
+        with self.lock:
+            if msg_id in self.msg_ids:
+                return False
+
+            self.msg_ids.add(msg_id)
+
+            return True
+
+    def take(self) -> list:
+        """Remove and return all the pending ids."""
+        with self.lock:
+            msg_ids = list(self.msg_ids)
+            self.msg_ids.clear()
+
+            return msg_ids
+
+    def __len__(self) -> int:
+        return len(self.msg_ids)
+
+    def __contains__(self, msg_id: int) -> bool:
+        return msg_id in self.msg_ids
@@ -16,10 +16,12 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from threading import Lock
+
 from pyrogram.api.core import Message, MsgContainer, Object
 from pyrogram.api.functions import Ping, HttpWait
 from pyrogram.api.types import MsgsAck
-from .msg_id import MsgId
+from .msg_id import SessionMsgId
 from .seq_no import SeqNo
 
 not_content_related = [Ping, HttpWait, MsgsAck, MsgContainer]
@@ -27,12 +29,24 @@ not_content_related = [Ping, HttpWait, MsgsAck, MsgContainer]
 
 class MsgFactory:
     def __init__(self):
+        self.msg_id = SessionMsgId()
         self.seq_no = SeqNo()
+        self.lock = Lock()
+
+    def __call__(self, body: Object or bytes, is_content_related: bool = None) -> Message:
+        # Bodies already serialized come with their kind, which bytes can't tell
+        if is_content_related is None:
+            is_content_related = self.is_content_related(body)
+
+        # Messages with higher msg ids must not have lower seq_nos. The lock is per session
+        with self.lock:
+            # The body length is filled in while the message is being serialized
+            return Message(
+                body,
+                self.msg_id(),
+                self.seq_no(is_content_related)
+            )
 
-    def __call__(self, body: Object) -> Message:
-        return Message(
-            body,
-            MsgId(),
-            self.seq_no(type(body) not in not_content_related),
-            len(body)
-        )
+    @staticmethod
+    def is_content_related(body: Object) -> bool:
+        return type(body) not in not_content_related
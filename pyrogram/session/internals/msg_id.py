@@ -33,3 +33,31 @@ class MsgId:
             cls.last_time = now
 
             return msg_id
+
+
+class SessionMsgId:
+    """Msg ids of a session, following the server clock.
+
+    Unlike MsgId, which is shared by the whole process, each session keeps its own last msg_id. It is not thread-safe
+    on its own: MsgFactory calls it under the same lock used for seq_nos, so that both increase together.
+    """
+
+    # Server times closer than this to the local clock (plus offset) are put down to network latency
+    MAX_DRIFT = 2
+
+    def __init__(self):
+        self.last = 0
+        self.offset = 0.0  # Server time minus local time, in seconds
+
+    def __call__(self) -> int:
+        # Client msg ids are divisible by 4 and must always increase
+        self.last = max(int((time() + self.offset) * 2 ** 32) & ~3, self.last + 4)
+
+        return self.last
+
+    def sync(self, server_msg_id: int, force: bool = False):
+        """Learn the server time from a msg_id the server sent."""
+        offset = server_msg_id / 2 ** 32 - time()
+
+        if force or abs(offset - self.offset) > self.MAX_DRIFT:
+            self.offset = offset
@@ -0,0 +1,62 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2018 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+
+
+class ReplayWindow:
+    """The last msg ids received from the server, to drop messages handled already.
+
+    https://core.telegram.org/mtproto/security_guidelines#checking-msg-id: a msg_id equal to any of the last N ones,
+    or lower than all of them, is ignored. Only the NetWorker checks msg ids, in the order they were received.
+
+    Server msg ids are times, not sequence numbers: they are far apart, and can't index a bitmap. They are kept in a
+    fixed-size ring instead, in the order they were received, with a set to look them up. Server msg ids increase,
+    so the oldest one in the ring is also the lowest: both checks take constant time.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.ring = array("q", bytes(8 * size))
+        self.head = 0  # Position of the oldest msg id, replaced by the next one once the ring is full
+        self.msg_ids = set()
+
+        # Messages dropped so far
+        self.duplicates = 0
+        self.too_old = 0
+
+    def check(self, msg_id: int) -> bool:
+        """Add a msg_id to the window; returns False if the message must be ignored."""
+        if msg_id in self.msg_ids:
+            self.duplicates += 1
+            return False
+
+        if len(self.msg_ids) == self.size:
+            oldest = self.ring[self.head]
+
+            if msg_id < oldest:
+                self.too_old += 1
+                return False
+
+            self.msg_ids.remove(oldest)
+
+        self.msg_ids.add(msg_id)
+        self.ring[self.head] = msg_id
+        self.head = (self.head + 1) % self.size
+
+        return True
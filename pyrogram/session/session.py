@@ -18,32 +18,63 @@
 
 import logging
 import platform
-import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import timedelta, datetime
 from hashlib import sha1, sha256
-from io import BytesIO
 from os import urandom
-from queue import Queue
-from threading import Event, Thread
+from queue import Queue, Empty
+from threading import Event, Lock, Thread
 
 import pyrogram
 from pyrogram import __copyright__, __license__, __version__
 from pyrogram.api import functions, types, core
-from pyrogram.api.all import layer
-from pyrogram.api.core import Message, Object, MsgContainer, Long, FutureSalt, Int
+from pyrogram.api.all import layer, updates as update_ids
+from pyrogram.api.core import Message, Object, MsgContainer, Long, FutureSalt, Int, Reader, GzipPacked, Template
 from pyrogram.api.errors import Error, InternalServerError
 from pyrogram.connection import Connection
 from pyrogram.crypto import AES, KDF
-from .internals import MsgId, MsgFactory, DataCenter
+from .internals import MsgId, MsgFactory, DataCenter, AckManager, ReplayWindow
 
 log = logging.getLogger(__name__)
 
 
-class Result:
-    def __init__(self):
-        self.value = None
-        self.event = Event()
+def decrypt(packet: bytes, auth_key: bytes, auth_key_id: bytes, session_id: bytes) -> bytes:
+    """Decrypt an incoming packet and check it belongs to the session. Standalone, to be run in worker processes"""
+    packet = memoryview(packet)
+
+    assert packet[:8] == auth_key_id, packet.tobytes()
+
+    msg_key = packet[8:24].tobytes()
+    aes_key, aes_iv = KDF(auth_key, msg_key, False)
+    data = AES.ige_decrypt(packet[24:], aes_key, aes_iv)
+
+    # https://core.telegram.org/mtproto/security_guidelines#checking-sha256-hash-value-of-msg-key
+    # 96 = 88 + 8 (incoming message)
+    msg_key_large = sha256(auth_key[96:96 + 32])
+    msg_key_large.update(data)
+    assert msg_key == msg_key_large.digest()[8:24]
+
+    # https://core.telegram.org/mtproto/security_guidelines#checking-session-id
+    assert data[8:16] == session_id
+
+    return data
+
+
+class Result(Future):
+    """The pending result of a request, completed when the server answers it or failed when it times out"""
+
+    def __init__(self, msg_id: int, body: bytes, is_content_related: bool, query_type: type, deadline: float):
+        super().__init__()
+
+        self.msg_id = msg_id
+
+        # The serialized request, kept to be sent again (e.g.: after a bad server salt)
+        self.body = body
+        self.is_content_related = is_content_related
+
+        self.query_type = query_type  # Errors are raised on behalf of the query type
+        self.deadline = deadline
 
 
 class Session:
@@ -62,13 +93,45 @@ class Session:
 
     INITIAL_SALT = 0x616e67656c696361
     NET_WORKERS = 1
+
+    # Incoming packets are decrypted by NET_WORKERS processes instead of threads. Only worth it with the pure Python
+    # AES fallback (no TgCrypto), which holds the GIL. Either way, packets are dispatched in the order they arrived
+    NET_PROCESSES = False
     WAIT_TIMEOUT = 15
     MAX_RETRIES = 5
     ACKS_THRESHOLD = 8
+
+    # How many of the last msg ids received are remembered, to drop duplicate and too old messages
+    REPLAY_WINDOW = 1024
+
+    # Future salts fetched at once (64 is the most the server gives, which lasts a couple of days). They are
+    # used in turn and saved in the session file, so that new sessions can skip fetching a salt while one is valid
+    FUTURE_SALTS = 64
+
+    # Pending acks are sent along with the next outgoing packet, or on their own after this many seconds
+    ACKS_INTERVAL = 1
+
+    # Put in the send queue to have the pending acks sent right away
+    ACKS = object()
     PING_INTERVAL = 5
 
+    # Requests this big or bigger are sent gzipped, if that makes them smaller. Set to None to disable
+    GZIP_THRESHOLD = 512
+
+    # Requests queued within this many seconds of each other are sent together, in a MsgContainer
+    BATCH_WINDOW = 0.001
+    BATCH_MAX_MESSAGES = 100
+    BATCH_MAX_SIZE = 64 * 1024  # Bigger messages are sent on their own
+
+    # File parts are mostly incompressible and templates are sent in hot loops: don't waste time trying
+    GZIP_EXCLUDED = (functions.upload.SaveFilePart, functions.upload.SaveBigFilePart, Template)
+
     notice_displayed = False
 
+    # The last help.GetConfig result, by test mode. While it has not expired, new sessions init their connection
+    # with a lighter query. It is the same for every DC
+    configs = {}
+
     BAD_MSG_DESCRIPTION = {
         16: "[16] msg_id too low, the client time has to be synchronized",
         17: "[17] msg_id too high, the client time has to be synchronized",
@@ -90,16 +153,30 @@ class Session:
                  auth_key: bytes,
                  api_id: int,
                  is_cdn: bool = False,
-                 client: pyrogram = None):
+                 client: pyrogram = None,
+                 lazy_decoding: bool = False,
+                 allowed_updates: list = None,
+                 ignored_updates: list = None,
+                 salts: list = None):
         if not Session.notice_displayed:
             print("Pyrogram v{}, {}".format(__version__, __copyright__))
             print("Licensed under the terms of the " + __license__, end="\n\n")
             Session.notice_displayed = True
 
         self.connection = Connection(DataCenter(dc_id, test_mode), proxy)
+        self.test_mode = test_mode
         self.api_id = api_id
         self.is_cdn = is_cdn
         self.client = client
+        self.lazy_decoding = lazy_decoding
+
+        # Updates are given either as constructor IDs or as types (e.g.: types.UpdateUserStatus)
+        ignored_updates = {getattr(i, "ID", i) for i in ignored_updates or []}
+
+        if allowed_updates is not None:
+            ignored_updates |= update_ids - {getattr(i, "ID", i) for i in allowed_updates}
+
+        self.ignored_updates = frozenset(ignored_updates) or None
 
         self.auth_key = auth_key
         self.auth_key_id = sha1(auth_key).digest()[-8:]
@@ -109,10 +186,32 @@ class Session:
 
         self.current_salt = None
 
-        self.pending_acks = set()
+        # Cached future salts, shared with the client and the other sessions using the same auth key
+        self.salts = salts if salts is not None else []
+
+        self.pending_acks = AckManager()
+
+        # Kept across restarts: after reconnecting, the server sends again what was not acknowledged
+        self.replay_window = ReplayWindow(self.REPLAY_WINDOW)
 
         self.recv_queue = Queue()
+        self.send_queue = Queue()
+
+        # Pending requests by msg_id. Results are set by net workers and expired by the TimeoutThread
         self.results = {}
+        self.results_lock = Lock()
+
+        # Msg ids inside each container sent, for the notifications that refer to the container as a whole
+        self.containers = {}
+
+        self.recv_thread = None
+        self.net_worker_thread = None
+        self.net_executor = None
+
+        self.send_thread = None
+
+        self.timeout_thread = None
+        self.timeout_thread_event = Event()
 
         self.ping_thread = None
         self.ping_thread_event = Event()
@@ -122,25 +221,52 @@ class Session:
 
         self.is_connected = Event()
 
+        # Total size of the gzipped requests, before and after compression
+        self.gzip_raw_bytes = 0
+        self.gzip_packed_bytes = 0
+
+        # Seconds the last start took, from connecting to being ready for requests
+        self.start_latency = None
+
+        # Messages and packets sent: more messages per packet means more batching
+        self.sent_messages = 0
+        self.sent_packets = 0
+
     def start(self):
+        start = time.monotonic()
+
         while True:
             try:
                 self.connection.connect()
 
-                for i in range(self.NET_WORKERS):
-                    Thread(target=self.net_worker, name="NetWorker#{}".format(i + 1)).start()
+                if self.NET_WORKERS > 1:
+                    self.net_executor = (
+                        ProcessPoolExecutor if self.NET_PROCESSES else ThreadPoolExecutor
+                    )(self.NET_WORKERS)
 
-                Thread(target=self.recv, name="RecvThread").start()
+                self.net_worker_thread = Thread(target=self.net_worker, name="NetWorker")
+                self.net_worker_thread.start()
 
-                self.current_salt = FutureSalt(0, 0, self.INITIAL_SALT)
-                self.current_salt = FutureSalt(0, 0, self._send(functions.Ping(0)).new_server_salt)
-                self.current_salt = self._send(functions.GetFutureSalts(1)).salts[0]
+                self.recv_thread = Thread(target=self.recv, name="RecvThread")
+                self.recv_thread.start()
 
-                self.next_salt_thread = Thread(target=self.next_salt, name="NextSaltThread")
-                self.next_salt_thread.start()
+                self.send_thread = Thread(target=self.send_worker, name="SendThread")
+                self.send_thread.start()
+
+                self.timeout_thread = Thread(target=self.expire_results, name="TimeoutThread")
+                self.timeout_thread.start()
+
+                # The handshake requests are all sent at once, without waiting for each other
+                self.current_salt = self.cached_salt()
+                salts = init = None
+
+                if self.current_salt is None:
+                    # With a wrong salt, the server answers with the right one and the requests are sent again
+                    self.current_salt = FutureSalt(datetime.now(), datetime.now(), self.INITIAL_SALT)
+                    salts = self.send_async(functions.GetFutureSalts(self.FUTURE_SALTS))
 
                 if not self.is_cdn:
-                    self._send(
+                    init = self.send_async(
                         functions.InvokeWithLayer(
                             layer,
                             functions.InitConnection(
@@ -149,11 +275,20 @@ class Session:
                                 self.SYSTEM_VERSION,
                                 self.APP_VERSION,
                                 "en", "", "en",
-                                functions.help.GetConfig(),
+                                functions.help.GetConfig() if self.config is None else functions.help.GetNearestDc()
                             )
                         )
                     )
 
+                if salts is not None:
+                    self.current_salt = self.use_salts(salts.result())
+
+                if init is not None and isinstance(init.result(), types.Config):
+                    Session.configs[self.test_mode] = init.result()
+
+                self.next_salt_thread = Thread(target=self.next_salt, name="NextSaltThread")
+                self.next_salt_thread.start()
+
                 self.ping_thread = Thread(target=self.ping, name="PingThread")
                 self.ping_thread.start()
 
@@ -168,13 +303,16 @@ class Session:
 
         self.is_connected.set()
 
-        log.debug("Session started")
+        self.start_latency = time.monotonic() - start
 
-    def stop(self):
+        log.info("Session started in {:.0f} ms".format(self.start_latency * 1000))
+
+    def stop(self, keep_pending: bool = False):
         self.is_connected.clear()
 
         self.ping_thread_event.set()
         self.next_salt_thread_event.set()
+        self.timeout_thread_event.set()
 
         if self.ping_thread is not None:
             self.ping_thread.join()
@@ -182,78 +320,148 @@ class Session:
         if self.next_salt_thread is not None:
             self.next_salt_thread.join()
 
+        if self.timeout_thread is not None:
+            self.timeout_thread.join()
+
         self.ping_thread_event.clear()
         self.next_salt_thread_event.clear()
+        self.timeout_thread_event.clear()
 
         self.connection.close()
 
-        for i in range(self.NET_WORKERS):
+        if self.send_thread is not None:
+            self.send_queue.put(None)
+            self.send_thread.join()
+            self.send_thread = None
+
+        # Packets already received are still dispatched
+        if self.recv_thread is not None:
+            self.recv_thread.join()
+            self.recv_thread = None
+
+        if self.net_worker_thread is not None:
             self.recv_queue.put(None)
+            self.net_worker_thread.join()
+            self.net_worker_thread = None
+
+        if self.net_executor is not None:
+            self.net_executor.shutdown()
+            self.net_executor = None
 
-        for i in self.results.values():
-            i.event.set()
+        # Requests still waiting fail (unless restarting); send retries them once the session is up again
+        if not keep_pending:
+            with self.results_lock:
+                pending = list(self.results)
+
+            self.fail_results(pending, ConnectionError("Session stopped"))
+
+        if self.gzip_raw_bytes:
+            log.info("Gzipped requests: {} -> {} bytes ({:.0%})".format(
+                self.gzip_raw_bytes,
+                self.gzip_packed_bytes,
+                self.gzip_packed_bytes / self.gzip_raw_bytes
+            ))
+
+        if self.sent_packets:
+            log.info("Sent {} messages in {} packets ({:.2f} messages per packet)".format(
+                self.sent_messages, self.sent_packets, self.batching_ratio
+            ))
+
+        if self.replay_window.duplicates or self.replay_window.too_old:
+            log.info("Dropped {} duplicate and {} too old messages".format(
+                self.replay_window.duplicates, self.replay_window.too_old
+            ))
 
         log.debug("Session stopped")
 
     def restart(self):
-        self.stop()
+        # Requests still waiting are not failed by stop: they are sent again once the new connection is up. Until
+        # then they can still time out, and they do fail if the session can't start again.
+        # They are only taken once the packets received already are dispatched, so that answered ones aren't sent
+        # again; send_again skips those answered meanwhile, during start
+        self.stop(keep_pending=True)
+
+        with self.results_lock:
+            pending = list(self.results)
+
         self.start()
+        self.send_again(pending)
 
-    def pack(self, message: Message):
-        data = Long(self.current_salt.salt) + self.session_id + message.write()
-        padding = urandom(-(len(data) + 12) % 16 + 12)
+        if pending:
+            log.info("Sent {} pending requests again".format(len(pending)))
+
+    @property
+    def batching_ratio(self) -> float:
+        """Average number of messages sent per packet, 1.0 meaning no batching at all."""
+        return self.sent_messages / self.sent_packets if self.sent_packets else 0.0
+
+    def pack(self, message: Message or bytes):
+        # The whole message tree is serialized once, into a single buffer
+        data = bytearray(Long(self.current_salt.salt) + self.session_id)
+
+        if isinstance(message, Message):
+            message.write_into(data)
+        else:
+            data += message
+        data += urandom(-(len(data) + 12) % 16 + 12)
 
         # 88 = 88 + 0 (outgoing message)
-        msg_key_large = sha256(self.auth_key[88: 88 + 32] + data + padding).digest()
-        msg_key = msg_key_large[8:24]
+        msg_key_large = sha256(self.auth_key[88: 88 + 32])
+        msg_key_large.update(data)
+        msg_key = msg_key_large.digest()[8:24]
         aes_key, aes_iv = KDF(self.auth_key, msg_key, True)
 
-        return self.auth_key_id + msg_key + AES.ige_encrypt(data + padding, aes_key, aes_iv)
+        return self.auth_key_id + msg_key + AES.ige_encrypt(data, aes_key, aes_iv)
 
-    def unpack(self, b: BytesIO) -> Message:
-        assert b.read(8) == self.auth_key_id, b.getvalue()
+    def unpack(self, b: Reader) -> Message:
+        return self.parse(decrypt(b.read(), self.auth_key, self.auth_key_id, self.session_id))
 
-        msg_key = b.read(16)
-        aes_key, aes_iv = KDF(self.auth_key, msg_key, False)
-        data = BytesIO(AES.ige_decrypt(b.read(), aes_key, aes_iv))
-        data.read(8)
-
-        # https://core.telegram.org/mtproto/security_guidelines#checking-session-id
-        assert data.read(8) == self.session_id
+    def parse(self, data: bytes) -> Message:
+        data = Reader(data, lazy=self.lazy_decoding, ignore=self.ignored_updates)
+        data.seek(16)  # Skip server salt and session id, checked by decrypt
 
         message = Message.read(data)
 
-        # https://core.telegram.org/mtproto/security_guidelines#checking-sha256-hash-value-of-msg-key
-        # https://core.telegram.org/mtproto/security_guidelines#checking-message-length
-        # 96 = 88 + 8 (incoming message)
-        assert msg_key == sha256(self.auth_key[96:96 + 32] + data.getvalue()).digest()[8:24]
-
         # https://core.telegram.org/mtproto/security_guidelines#checking-msg-id
-        # TODO: check for lower msg_ids
+        # Lower and duplicate msg ids are checked on dispatch, in order
         assert message.msg_id % 2 != 0
 
         return message
 
+    def submit(self, packet: bytes):
+        # Packets are unpacked in parallel, but queued (and thus dispatched) in the order they arrived
+        if self.net_executor is None:
+            return packet
+        elif self.NET_PROCESSES:
+            # Only the decryption is worth the trip to another process: messages would be pickled back
+            return self.net_executor.submit(decrypt, packet, self.auth_key, self.auth_key_id, self.session_id)
+        else:
+            return self.net_executor.submit(self.unpack, Reader(packet))
+
     def net_worker(self):
-        name = threading.current_thread().name
-        log.debug("{} started".format(name))
+        log.debug("NetWorker started")
 
         while True:
-            packet = self.recv_queue.get()
+            item = self.recv_queue.get()
 
-            if packet is None:
+            if item is None:
                 break
 
             try:
-                self.unpack_dispatch_and_ack(packet)
+                if isinstance(item, Future):
+                    item = item.result()
+                    self.dispatch_and_ack(item if isinstance(item, Message) else self.parse(item))
+                else:
+                    self.unpack_dispatch_and_ack(item)
             except Exception as e:
                 log.error(e, exc_info=True)
 
-        log.debug("{} stopped".format(name))
+        log.debug("NetWorker stopped")
 
     def unpack_dispatch_and_ack(self, packet: bytes):
-        data = self.unpack(BytesIO(packet))
+        self.dispatch_and_ack(self.unpack(Reader(packet)))
 
+    def dispatch_and_ack(self, data: Message):
         messages = (
             data.body.messages
             if isinstance(data.body, MsgContainer)
@@ -263,11 +471,18 @@ class Session:
         log.debug(data)
 
         for msg in messages:
+            is_new = self.replay_window.check(msg.msg_id)
+
+            # Duplicates are acknowledged again: the server sent them again because it missed the ack
             if msg.seq_no % 2 != 0:
-                if msg.msg_id in self.pending_acks:
-                    continue
-                else:
-                    self.pending_acks.add(msg.msg_id)
+                self.pending_acks.add(msg.msg_id)
+
+            if not is_new:
+                log.debug("Dropped message {} (duplicate or too old)".format(msg.msg_id))
+                continue
+
+            # Msg ids of the server carry its time. Replayed messages are not trusted with it
+            self.msg_factory.msg_id.sync(msg.msg_id)
 
             if isinstance(msg.body, (types.MsgDetailedInfo, types.MsgNewDetailedInfo)):
                 self.pending_acks.add(msg.body.answer_msg_id)
@@ -276,9 +491,24 @@ class Session:
             if isinstance(msg.body, types.NewSessionCreated):
                 continue
 
+            if self.ignored_updates and self.is_ignored(msg.body):
+                continue
+
             msg_id = None
 
-            if isinstance(msg.body, (types.BadMsgNotification, types.BadServerSalt)):
+            if isinstance(msg.body, types.BadServerSalt):
+                # Cached salts are no good either. The new one has no known lifetime: NextSaltThread fetches more at once
+                self.current_salt = FutureSalt(datetime.now(), datetime.now(), msg.body.new_server_salt)
+                self.salts[:] = []
+
+                self.resend(msg.body.bad_msg_id)
+            elif isinstance(msg.body, types.BadMsgNotification) and msg.body.error_code in (16, 17):
+                # The msg_id was too low or too high: the local clock is off. Its time is taken from the notification
+                self.msg_factory.msg_id.sync(msg.msg_id, force=True)
+                log.warning("Server time offset: {:+.1f}s".format(self.msg_factory.msg_id.offset))
+
+                self.resend(msg.body.bad_msg_id)
+            elif isinstance(msg.body, types.BadMsgNotification):
                 msg_id = msg.body.bad_msg_id
             elif isinstance(msg.body, (core.FutureSalts, types.RpcResult)):
                 msg_id = msg.body.req_msg_id
@@ -288,19 +518,27 @@ class Session:
                 if self.client is not None:
                     self.client.updates_queue.put(msg.body)
 
-            if msg_id in self.results:
-                self.results[msg_id].value = getattr(msg.body, "result", msg.body)
-                self.results[msg_id].event.set()
+            if msg_id is not None:
+                with self.results_lock:
+                    result = self.results.pop(msg_id, None)
+
+                if result is not None:
+                    self.complete(result, getattr(msg.body, "result", msg.body))
 
+        # Too many acks to wait for the next packet or the timer
         if len(self.pending_acks) >= self.ACKS_THRESHOLD:
-            log.info("Send {} acks".format(len(self.pending_acks)))
+            self.send_queue.put(self.ACKS)
 
-            try:
-                self._send(types.MsgsAck(list(self.pending_acks)), False)
-            except (OSError, TimeoutError):
-                pass
-            else:
-                self.pending_acks.clear()
+    @staticmethod
+    def is_ignored(body: Object) -> bool:
+        # Ignored updates were skipped at decode time, leaving nothing or empty containers behind
+        if isinstance(body, types.UpdateShort):
+            return body.update is None
+
+        if isinstance(body, (types.Update, types.UpdatesCombined)):
+            return not body.updates
+
+        return body is None
 
     def ping(self):
         log.debug("PingThread started")
@@ -343,13 +581,39 @@ class Session:
                 break
 
             try:
-                self.current_salt = self._send(functions.GetFutureSalts(1)).salts[0]
+                self.current_salt = self.cached_salt() or self.fetch_salts()
             except (OSError, TimeoutError, Error):
                 self.connection.close()
                 break
 
         log.debug("NextSaltThread stopped")
 
+    def cached_salt(self) -> FutureSalt or None:
+        # A cached salt valid now and for the next 15 minutes at least, the longest lasting one
+        now = datetime.now()
+        salts = [i for i in self.salts if i.valid_since <= now and i.valid_until - now > timedelta(minutes=15)]
+
+        return max(salts, key=lambda i: i.valid_until) if salts else None
+
+    @property
+    def config(self) -> types.Config or None:
+        """The cached help.GetConfig result, None if expired or never fetched."""
+        config = Session.configs.get(self.test_mode)
+
+        return config if config is not None and config.expires > time.time() else None
+
+    def fetch_salts(self) -> FutureSalt:
+        return self.use_salts(self._send(functions.GetFutureSalts(self.FUTURE_SALTS)))
+
+    def use_salts(self, future_salts: core.FutureSalts) -> FutureSalt:
+        salts = future_salts.salts
+        self.salts[:] = salts
+
+        log.info("Fetched {} future salts, valid until {}".format(len(salts), salts[-1].valid_until))
+
+        # The first one is valid now
+        return salts[0]
+
     def recv(self):
         log.debug("RecvThread started")
 
@@ -358,46 +622,266 @@ class Session:
 
             if packet is None or len(packet) == 4:
                 if packet:
-                    log.warning("Server sent \"{}\"".format(Int.read(BytesIO(packet))))
+                    log.warning("Server sent \"{}\"".format(Int.read(Reader(packet))))
 
                 if self.is_connected.is_set():
                     Thread(target=self.restart, name="RestartThread").start()
                 break
 
-            self.recv_queue.put(packet)
+            self.recv_queue.put(self.submit(packet))
 
         log.debug("RecvThread stopped")
 
-    def _send(self, data: Object, wait_response: bool = True):
-        message = self.msg_factory(data)
-        msg_id = message.msg_id
+    def send_worker(self):
+        log.debug("SendThread started")
 
-        if wait_response:
-            self.results[msg_id] = Result()
+        while True:
+            try:
+                message = self.send_queue.get(timeout=self.ACKS_INTERVAL)
+            except Empty:
+                message = self.ACKS  # Nothing sent for a while: the acks go on their own
+
+            if message is None:
+                break
+
+            batch = [message]
+            deadline = time.monotonic() + self.BATCH_WINDOW
+
+            while len(batch) < self.BATCH_MAX_MESSAGES:
+                try:
+                    message = self.send_queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except Empty:
+                    break
+
+                if message is None:
+                    break
+
+                batch.append(message)
+
+            try:
+                self.flush(batch)
+            except Exception as e:
+                log.error(e, exc_info=True)
+
+            if message is None:
+                break
+
+        log.debug("SendThread stopped")
+
+    def flush(self, batch: list):
+        batch = [message for message in batch if message is not self.ACKS]
+        acks = self.pending_acks.take()
+
+        # Acks travel for free along with the requests
+        if acks:
+            log.debug("Send {} acks".format(len(acks)))
+            batch.append(self.msg_factory(types.MsgsAck(acks)))
+
+        if not batch:
+            return
+
+        group, raws, size = [], [], 0
+
+        for message in batch:
+            raw = bytearray()
+
+            # Requests come serialized already; still, a message that can't be written must not stop the SendThread
+            try:
+                message.write_into(raw)
+            except Exception as e:
+                log.error(e, exc_info=True)
+                self.fail_results([message.msg_id], e)
+                continue
 
-        payload = self.pack(message)
+            if group and (size + len(raw) > self.BATCH_MAX_SIZE or len(group) == self.BATCH_MAX_MESSAGES):
+                self.send_packet(group, raws)
+                group, raws, size = [], [], 0
+
+            group.append(message)
+            raws.append(raw)
+            size += len(raw)
+
+        if group:
+            self.send_packet(group, raws)
+
+    def send_packet(self, messages: list, raws: list):
+        if len(messages) == 1:
+            payload = self.pack(raws[0])
+        else:
+            container = self.msg_factory(MsgContainer(raws))
+
+            with self.results_lock:
+                self.containers[container.msg_id] = [message.msg_id for message in messages]
+
+            payload = self.pack(container)
 
         try:
             self.connection.send(payload)
         except OSError as e:
-            self.results.pop(msg_id, None)
-            raise e
+            # Waiting requests fail right away, instead of timing out
+            self.fail_results([message.msg_id for message in messages], e)
+        else:
+            self.sent_messages += len(messages)
+            self.sent_packets += 1
+
+    def serialize(self, data: Object) -> bytes:
+        # Requests are serialized once, by the caller: errors are raised to it, and later patches of a Template don't
+        # change what was queued. Big enough ones are sent gzipped, if that makes them smaller
+        raw = data.write()
+
+        if self.GZIP_THRESHOLD is None or isinstance(data, self.GZIP_EXCLUDED) or len(raw) < self.GZIP_THRESHOLD:
+            return raw
+
+        packed = GzipPacked.compress(raw)
+
+        log.debug("Gzip {}: {} -> {} bytes ({:.0%})".format(
+            type(data).__name__, len(raw), len(packed), len(packed) / len(raw)
+        ))
+
+        if len(packed) >= len(raw):
+            return raw
+
+        self.gzip_raw_bytes += len(raw)
+        self.gzip_packed_bytes += len(packed)
+
+        return GzipPacked(packed).write()
+
+    def complete(self, result: Result, value: Object):
+        if result.done():  # Cancelled meanwhile
+            return
+
+        if isinstance(value, types.RpcError):
+            try:
+                Error.raise_it(value, result.query_type)
+            except Exception as e:
+                result.set_exception(e)
+        elif isinstance(value, types.BadMsgNotification):
+            result.set_exception(Exception(self.BAD_MSG_DESCRIPTION.get(
+                value.error_code,
+                "Error code {}".format(value.error_code)
+            )))
+        else:
+            result.set_result(value)
+
+    def fail_results(self, msg_ids: list, exception: Exception):
+        with self.results_lock:
+            results = [self.results.pop(i) for i in msg_ids if i in self.results]
+
+        for result in results:
+            if not result.done():
+                result.set_exception(exception)
+
+    def expire_results(self):
+        log.debug("TimeoutThread started")
 
+        # A single thread times out every pending request, instead of each caller waiting on its own
+        while not self.timeout_thread_event.wait(1):
+            now = time.monotonic()
+
+            with self.results_lock:
+                expired = [i for i, result in self.results.items() if result.deadline <= now]
+
+            if expired:
+                self.fail_results(expired, TimeoutError())
+
+            # Nothing refers to containers this old anymore. Msg ids carry the (server) time they were sent at
+            oldest = time.time() + self.msg_factory.msg_id.offset - self.WAIT_TIMEOUT
+
+            with self.results_lock:
+                for i in [i for i in self.containers if (i >> 32) < oldest]:
+                    del self.containers[i]
+
+        log.debug("TimeoutThread stopped")
+
+    def resend(self, msg_id: int):
+        # The msg_id is either of a request or of a container of requests
+        with self.results_lock:
+            msg_ids = self.containers.pop(msg_id, [msg_id])
+
+        self.send_again(msg_ids)
+
+    def send_again(self, msg_ids: list):
+        # Requests still waiting are sent again with new msg ids, and wait for WAIT_TIMEOUT seconds again
+        with self.results_lock:
+            results = [self.results.pop(i) for i in msg_ids if i in self.results]
+
+        for result in results:
+            if result.done():
+                continue
+
+            message = self.msg_factory(result.body, result.is_content_related)
+            result.msg_id = message.msg_id
+            result.deadline = time.monotonic() + self.WAIT_TIMEOUT
+
+            with self.results_lock:
+                self.results[message.msg_id] = result
+
+            self.send_queue.put(message)
+
+    def cancelled(self, result: Result):
+        if not result.cancelled():
+            return
+
+        with self.results_lock:
+            pending = self.results.pop(result.msg_id, None) is not None
+
+        # Tell the server not to bother sending the result
+        if pending:
+            self._send(functions.RpcDropAnswer(result.msg_id), False)
+
+    def send_async(self, data: Object) -> Result:
+        """Send a function without waiting for its result.
+
+        Args:
+            data (:obj:`Object`):
+                The function to send.
+
+        Returns:
+            A :obj:`Future <concurrent.futures.Future>` of the result. It raises the same errors as send, fails with
+            TimeoutError after WAIT_TIMEOUT seconds and can be cancelled while pending. Unlike send, nothing is retried.
+        """
+        is_content_related = self.msg_factory.is_content_related(data)
+        message = self.msg_factory(self.serialize(data), is_content_related)
+        result = Result(
+            message.msg_id,
+            message.body,
+            is_content_related,
+            type(data.query if isinstance(data, Template) else data),
+            time.monotonic() + self.WAIT_TIMEOUT
+        )
+
+        with self.results_lock:
+            self.results[message.msg_id] = result
+
+        result.add_done_callback(self.cancelled)
+
+        # Sent by the SendThread, possibly together with other requests
+        self.send_queue.put(message)
+
+        return result
+
+    def _send(self, data: Object, wait_response: bool = True):
         if wait_response:
-            self.results[msg_id].event.wait(self.WAIT_TIMEOUT)
-            result = self.results.pop(msg_id).value
-
-            if result is None:
-                raise TimeoutError
-            elif isinstance(result, types.RpcError):
-                Error.raise_it(result, type(data))
-            elif isinstance(result, types.BadMsgNotification):
-                raise Exception(self.BAD_MSG_DESCRIPTION.get(
-                    result.error_code,
-                    "Error code {}".format(result.error_code)
-                ))
-            else:
-                return result
+            result = self.send_async(data)
+
+            # TimeoutThread fails the request at its deadline; this is only a safety net if it can't (e.g.: while
+            # restarting). Sending the request again moves its deadline, and the wait goes on until the new one
+            while True:
+                try:
+                    return result.result(max(result.deadline - time.monotonic(), 0) + 1)
+                except FutureTimeoutError:
+                    # Failed by TimeoutThread: the same exception, since Python 3.11
+                    if result.done():
+                        raise
+
+                    if time.monotonic() < result.deadline:
+                        continue
+
+                # Cancelled, the request is forgotten: it is not sent again while send retries it
+                if result.cancel():
+                    raise TimeoutError() from None
+
+        self.send_queue.put(self.msg_factory(self.serialize(data), self.msg_factory.is_content_related(data)))
 
     def send(self, data: Object, retries: int = MAX_RETRIES):
         self.is_connected.wait(self.WAIT_TIMEOUT)